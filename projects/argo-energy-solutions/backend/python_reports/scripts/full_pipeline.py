@@ -3,10 +3,14 @@ Complete Pipeline: Fetch data from Best.Energy API and generate VEM Report
 One-command solution to go from API to PDF report
 """
 
+import logging
+import sys
 from fetch_bestenergy_data import BestEnergyDataFetcher
 from generate_vem_report import VEMReportGenerator
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 def run_full_pipeline(
     customer_id: str = 'wilson-center',
@@ -29,18 +33,18 @@ def run_full_pipeline(
         cost_per_kwh: Electricity cost per kWh
         use_mock: Use mock data instead of API (for testing)
     """
-    print("="*70)
-    print("🚀 FULL VEM REPORT PIPELINE")
-    print("="*70)
-    print(f"Customer: {customer_id}")
-    print(f"Baseline: {baseline_start} to {baseline_end}")
-    print(f"Report: {report_start} to {report_end}")
-    print("="*70)
-    print()
+    logger.info("="*70)
+    logger.info("🚀 FULL VEM REPORT PIPELINE")
+    logger.info("="*70)
+    logger.info(f"Customer: {customer_id}")
+    logger.info(f"Baseline: {baseline_start} to {baseline_end}")
+    logger.info(f"Report: {report_start} to {report_end}")
+    logger.info("="*70)
+    logger.info("")
     
     # Step 1: Fetch data from API
-    print("STEP 1: Fetching energy data from Best.Energy API")
-    print("-"*70)
+    logger.info("STEP 1: Fetching energy data from Best.Energy API")
+    logger.info("-"*70)
     
     fetcher = BestEnergyDataFetcher()
     
@@ -49,41 +53,43 @@ def run_full_pipeline(
     latest_date = max(baseline_end, report_end)
     
     if use_mock:
-        print("📝 Using mock data for testing...")
+        logger.info("📝 Using mock data for testing...")
         df = fetcher.generate_mock_data(
             customer_id=customer_id,
             start_date=earliest_date,
             end_date=latest_date,
-            output_csv='energy_data.csv'
+            output_csv='energy_data.parquet'
         )
     else:
         df = fetcher.fetch_customer_data(
             customer_id=customer_id,
             start_date=earliest_date,
             end_date=latest_date,
-            output_csv='energy_data.csv'
+            output_csv='energy_data.parquet'
         )
     
     if df.empty:
-        print("\n❌ No data fetched. Pipeline stopped.")
-        print("💡 Try running with --mock flag for testing:")
-        print("   python full_pipeline.py --mock")
+        logger.error("\n❌ No data fetched. Pipeline stopped.")
+        logger.info("💡 Try running with --mock flag for testing:")
+        logger.info("   python full_pipeline.py --mock")
         return None
     
-    print("\n" + "="*70)
+    logger.info("\n" + "="*70)
     
     # Step 2: Generate VEM Report
-    print("\nSTEP 2: Generating VEM Report")
-    print("-"*70)
+    logger.info("\nSTEP 2: Generating VEM Report")
+    logger.info("-"*70)
     
     try:
+        # Hand the fetched frame over directly instead of re-parsing the CSV
         generator = VEMReportGenerator(
-            csv_path='energy_data.csv',
+            csv_path='energy_data.parquet',
             baseline_start=baseline_start,
             baseline_end=baseline_end,
             report_start=report_start,
             report_end=report_end,
-            cost_per_kwh=cost_per_kwh
+            cost_per_kwh=cost_per_kwh,
+            df=df
         )
         
         # Generate the report
@@ -91,26 +97,26 @@ def run_full_pipeline(
         generator.generate_pdf_report(report_file)
         
         # Print summary
-        print("\n" + "="*70)
-        print("📊 REPORT SUMMARY")
-        print("="*70)
+        logger.info("\n" + "="*70)
+        logger.info("📊 REPORT SUMMARY")
+        logger.info("="*70)
         stats = generator.summary_stats
-        print(f"Total Savings: {stats['total_savings_kwh']:,.0f} kWh")
-        print(f"Cost Savings: ${stats['total_savings_dollars']:,.2f}")
-        print(f"Percent Reduction: {stats['percent_reduction']:.1f}%")
-        print(f"Days Analyzed: {stats['num_days']}")
-        print(f"Average Daily Savings: {stats['avg_daily_savings_kwh']:,.1f} kWh")
-        print("="*70)
+        logger.info(f"Total Savings: {stats['total_savings_kwh']:,.0f} kWh")
+        logger.info(f"Cost Savings: ${stats['total_savings_dollars']:,.2f}")
+        logger.info(f"Percent Reduction: {stats['percent_reduction']:.1f}%")
+        logger.info(f"Days Analyzed: {stats['num_days']}")
+        logger.info(f"Average Daily Savings: {stats['avg_daily_savings_kwh']:,.1f} kWh")
+        logger.info("="*70)
         
-        print(f"\n✅ PIPELINE COMPLETE!")
-        print(f"📄 Report: {report_file}")
-        print(f"📊 Data: energy_data.csv")
-        print("="*70)
+        logger.info(f"\n✅ PIPELINE COMPLETE!")
+        logger.info(f"📄 Report: {report_file}")
+        logger.info(f"📊 Data: energy_data.parquet")
+        logger.info("="*70)
         
         return report_file
         
     except Exception as e:
-        print(f"\n❌ Error generating report: {str(e)}")
+        logger.error(f"\n❌ Error generating report: {str(e)}")
         raise
 
 
@@ -144,6 +150,8 @@ def main():
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    
     # Run the full pipeline
     run_full_pipeline(
         customer_id=args.customer_id,
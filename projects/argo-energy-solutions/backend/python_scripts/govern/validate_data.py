@@ -285,26 +285,21 @@ class DataValidator:
         print("🔌 Checking Channel Health...")
         cur = self.conn.cursor()
         
-        # Get channel statistics
+        cur.execute("SELECT COUNT(*) FROM channels")
+        channel_count = cur.fetchone()[0]
+        
+        self.stats['channel_count'] = channel_count
+        
+        # Only pull the anomalous channels; the filtering happens server-side
         cur.execute("""
-            SELECT 
-                c.channel_id,
-                c.channel_name,
-                COUNT(r.timestamp) as reading_count,
-                MIN(r.timestamp) as first_reading,
-                MAX(r.timestamp) as last_reading,
-                AVG(r.power_kw) as avg_power,
-                STDDEV(r.power_kw) as stddev_power
+            SELECT c.channel_id, c.channel_name
             FROM channels c
-            LEFT JOIN readings r ON c.channel_id = r.channel_id
-            GROUP BY c.channel_id, c.channel_name
-            ORDER BY reading_count DESC
+            WHERE NOT EXISTS (
+                SELECT 1 FROM readings r WHERE r.channel_id = c.channel_id
+            )
+            ORDER BY c.channel_id
         """)
-        channels = cur.fetchall()
-        
-        self.stats['channel_count'] = len(channels)
-        
-        inactive_channels = [ch for ch in channels if ch[2] == 0]  # reading_count = 0
+        inactive_channels = cur.fetchall()
         
         if inactive_channels:
             print(f"   ⚠️  {len(inactive_channels)} channels have no readings")
@@ -312,10 +307,19 @@ class DataValidator:
                 print(f"      {ch[1]} (ID: {ch[0]})")
             self.warnings.append(f"{len(inactive_channels)} inactive channels")
         else:
-            print(f"   ✅ All {len(channels)} channels have readings")
+            print(f"   ✅ All {channel_count} channels have readings")
         
         # Check for channels with suspiciously low variance
-        flat_channels = [ch for ch in channels if ch[2] > 100 and ch[6] and ch[6] < 0.01]
+        cur.execute("""
+            SELECT c.channel_id, c.channel_name
+            FROM channels c
+            JOIN readings r ON c.channel_id = r.channel_id
+            GROUP BY c.channel_id, c.channel_name
+            HAVING COUNT(r.timestamp) > 100
+            AND STDDEV(r.power_kw) > 0
+            AND STDDEV(r.power_kw) < 0.01
+        """)
+        flat_channels = cur.fetchall()
         
         if flat_channels:
             print(f"   ⚠️  {len(flat_channels)} channels with unusually flat readings")
@@ -6,19 +6,38 @@ Provides commands for running the full pipeline or individual steps.
 """
 
 import argparse
+import copy
 import logging
+import os
 import sys
-import yaml
-import pandas as pd
 import json
 from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import groupby
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
-from .salesforce_export import SalesforceExporter
-from .transformer import DataTransformer
-from .tableau_publish import TableauPublisher
-from .notifier import notify_status
+from .fsutil import CSV_BUFFER_BYTES, ensure_dir
+
+# pandas, yaml and the Salesforce/Tableau clients are imported by the functions
+# that use them, so light commands such as `status` start without loading them
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import orjson  # Optional: faster JSON for status files
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+    _loads = json.loads
 
 
 def setup_logging(level: str = 'INFO'):
@@ -32,21 +51,65 @@ def setup_logging(level: str = 'INFO'):
     )
 
 
+# Parsed configs keyed by absolute path -> (mtime, size, config); LRU-evicted
+_CONFIG_CACHE: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+_CONFIG_CACHE_SIZE = 100
+
+
 def load_config(config_path: str) -> Dict[str, Any]:
-    """Load YAML configuration file."""
+    """
+    Load YAML configuration file.
+    
+    Parsed configs are cached per path and reused until the file's mtime or
+    size changes. Callers get a deep copy, so mutating it is safe.
+    """
     try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-        return config
+        path = os.path.abspath(config_path)
+        st = os.stat(path)
+        cached = _CONFIG_CACHE.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime, st.st_size):
+            _CONFIG_CACHE.move_to_end(path)
+            return copy.deepcopy(cached[2])
+        
+        import yaml
+        # libyaml-backed safe loader when available
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        with open(path, 'r') as f:
+            config = yaml.load(f, Loader=loader)
+        _CONFIG_CACHE[path] = (st.st_mtime, st.st_size, config)
+        _CONFIG_CACHE.move_to_end(path)
+        if len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+            _CONFIG_CACHE.popitem(last=False)
+        return copy.deepcopy(config)
     except Exception as e:
         logging.error(f"Failed to load config from {config_path}: {e}")
         raise
 
 
+load_config.cache_clear = _CONFIG_CACHE.clear
+
+
+def _concurrency(config: Dict[str, Any]) -> int:
+    """Worker count for per-report/per-transform parallelism (pipeline.concurrency, default 4)."""
+    return max(1, int((config.get('pipeline') or {}).get('concurrency', 4)))
+
+
+def _run_parallel(func, items: List[Any], max_workers: int) -> List[Any]:
+    """
+    Run func over items in a thread pool, returning results in item order.
+    
+    Exports and transforms are I/O bound (HTTP, CSV), so threads overlap
+    them despite the GIL. The first failure (in item order) is re-raised.
+    """
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
 def run_export_step(config: Dict[str, Any]) -> List[str]:
     """Run Salesforce export step."""
     logger = logging.getLogger(__name__)
-    exporter = SalesforceExporter()
     exported_files = []
     
     reports = config.get('reports', [])
@@ -54,19 +117,22 @@ def run_export_step(config: Dict[str, Any]) -> List[str]:
         logger.warning("No reports configured for export")
         return exported_files
     
-    for report_config in reports:
+    from .salesforce_export import SalesforceExporter
+    exporter = SalesforceExporter()
+    
+    def export_one(report_config: Dict[str, Any]) -> str:
         try:
             report_id = report_config['report_id']
             output_path = report_config['output']
             
             logger.info(f"Exporting report {report_id} to {output_path}")
-            exported_file = exporter.export_report_to_csv(report_id, output_path)
-            exported_files.append(exported_file)
+            return exporter.export_report_to_csv(report_id, output_path)
             
         except Exception as e:
             logger.error(f"Failed to export report {report_config}: {e}")
             raise
     
+    exported_files.extend(_run_parallel(export_one, reports, _concurrency(config)))
     return exported_files
 
 
@@ -80,7 +146,9 @@ def run_transform_step(config: Dict[str, Any]) -> List[str]:
         logger.warning("No transforms configured")
         return transformed_files
     
-    for transform_config in transforms:
+    from .transformer import DataTransformer
+    
+    def transform_one(transform_config: Dict[str, Any]) -> str:
         try:
             input_file = transform_config['input']
             output_file = transform_config['output']
@@ -88,24 +156,36 @@ def run_transform_step(config: Dict[str, Any]) -> List[str]:
             
             logger.info(f"Transforming {input_file} -> {output_file}")
             
-            # Load, transform, and save
             transformer = DataTransformer()
+            chunksize = transform_config.get('chunksize')
+            if chunksize:
+                # Stream the file instead of holding it in memory
+                transformer.transform_csv_chunked(input_file, output_file, steps, int(chunksize))
+                return output_file
+            
+            # Load, transform, and save
             transformer.load_csv(input_file)
             
             if steps:
                 transformer.apply_transforms(steps)
             
             transformer.save_csv(output_file)
-            transformed_files.append(output_file)
             
             # Log summary
             summary = transformer.get_summary()
             logger.info(f"Transform complete: {summary['rows']} rows, {summary['columns']} columns")
+            return output_file
             
         except Exception as e:
             logger.error(f"Failed to transform {transform_config}: {e}")
             raise
     
+    # Transforms that read another transform's output must run in order
+    outputs = {t.get('output') for t in transforms}
+    chained = any(t.get('input') in outputs and t.get('input') != t.get('output') for t in transforms)
+    max_workers = 1 if chained else _concurrency(config)
+    
+    transformed_files.extend(_run_parallel(transform_one, transforms, max_workers))
     return transformed_files
 
 
@@ -120,7 +200,8 @@ def run_publish_step(config: Dict[str, Any]) -> List[str]:
         return published_items
     
     try:
-        with TableauPublisher() as publisher:
+        from .tableau_publish import pooled_publisher
+        with pooled_publisher() as publisher:
             # Publish datasource if configured
             if 'datasource' in publish_config and 'file' in publish_config:
                 datasource_name = publish_config['datasource']
@@ -131,10 +212,25 @@ def run_publish_step(config: Dict[str, Any]) -> List[str]:
                 datasource_id = publisher.publish_datasource(
                     file_path=file_path,
                     datasource_name=datasource_name,
-                    project_name=project_name
+                    project_name=project_name,
+                    precision=publish_config.get('precision', 'full')
                 )
                 published_items.append(f"datasource:{datasource_id}")
             
+            # Several datasources are uploaded concurrently
+            if publish_config.get('datasources'):
+                items = [{
+                    'file_path': ds['file'],
+                    'datasource_name': ds['datasource'],
+                    'project_name': ds.get('project', publish_config.get('project', 'Default')),
+                    'precision': ds.get('precision', publish_config.get('precision', 'full')),
+                } for ds in publish_config['datasources']]
+                logger.info(f"Publishing {len(items)} datasources")
+                # Upload fan-out is tuned separately from exports/transforms when set
+                max_workers = max(1, int(publish_config.get('concurrency') or _concurrency(config)))
+                datasource_ids = publisher.publish_datasources(items, max_workers=max_workers)
+                published_items.extend(f"datasource:{datasource_id}" for datasource_id in datasource_ids)
+            
             # Create workbook if configured
             if 'workbook' in publish_config:
                 workbook_name = publish_config['workbook']
@@ -154,6 +250,105 @@ def run_publish_step(config: Dict[str, Any]) -> List[str]:
     return published_items
 
 
+# Masters at least this large are deduped chunk by chunk instead of in memory
+_CHUNKED_APPEND_MIN_BYTES = 256 * 1024 * 1024
+
+
+@contextmanager
+def _atomic_open(path: str, mode: str, **kwargs) -> Iterator[IO]:
+    """
+    Open a temp file beside path that replaces it only once fully written.
+    
+    os.replace is atomic, so a crash mid-write leaves the previous file intact
+    instead of a truncated one.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _atomic_write_csv(df: "pd.DataFrame", path: str):
+    """Write df to path as CSV, atomically."""
+    with _atomic_open(path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_BYTES) as out:
+        df.to_csv(out, index=False)
+
+
+def _atomic_write_json(obj: Any, path: Path):
+    """Write obj to path as JSON, atomically."""
+    with _atomic_open(str(path), 'wb') as f:
+        f.write(_dumps(obj))
+
+
+def _snapshot_order(dates: "pd.Series") -> "pd.Series":
+    """
+    snapshot_date values as datetimes for keep: latest, with unparseable or
+    missing dates ordered after every real date (where sorting the in-memory
+    master by snapshot_date puts them).
+    """
+    import pandas as pd
+    
+    return pd.to_datetime(dates, errors='coerce', cache=True).fillna(pd.Timestamp.max)
+
+
+def _append_dedupe_chunked(src_df: "pd.DataFrame", master_file: str, key: str,
+                           by_snapshot_date: bool, chunksize: int,
+                           dtype: Optional[Dict[str, str]] = None) -> int:
+    """
+    Merge src_df into a large master CSV without loading the master at once.
+    
+    The master is streamed in chunks into a new file beside it, dropping rows
+    superseded by a source row with the same key (by snapshot_date when
+    by_snapshot_date is set, otherwise the source always wins). Surviving source
+    rows are appended and the new file replaces the master. The master is
+    assumed to be unique per key already, as written by this step.
+    
+    Returns:
+        Row count of the new master
+    """
+    import pandas as pd
+    
+    if by_snapshot_date:
+        src_df = src_df.iloc[_snapshot_order(src_df['snapshot_date']).to_numpy().argsort(kind='stable')]
+    src_df = src_df.drop_duplicates(subset=[key], keep='last')
+    src_dates = _snapshot_order(src_df['snapshot_date']).set_axis(src_df[key]) if by_snapshot_date else None
+    
+    master_cols = pd.read_csv(master_file, nrows=0).columns.tolist()
+    all_cols = master_cols + [c for c in src_df.columns if c not in master_cols]
+    newer_in_master = set()
+    total = 0
+    
+    with _atomic_open(master_file, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_BYTES) as out:
+        pd.DataFrame(columns=all_cols).to_csv(out, index=False)
+        for chunk in pd.read_csv(master_file, chunksize=chunksize, dtype=dtype):
+            replaced = chunk[key].isin(src_df[key])
+            if by_snapshot_date:
+                newer = replaced & (_snapshot_order(chunk['snapshot_date']) > chunk[key].map(src_dates))
+                newer_in_master.update(chunk.loc[newer, key])
+                replaced &= ~newer
+            kept = chunk[~replaced]
+            kept.reindex(columns=all_cols).to_csv(out, header=False, index=False)
+            total += len(kept)
+        
+        src_kept = src_df[~src_df[key].isin(newer_in_master)]
+        src_kept.reindex(columns=all_cols).to_csv(out, header=False, index=False)
+        total += len(src_kept)
+    return total
+
+
+def _append_group_key(append_cfg: Dict[str, Any]) -> Tuple[Any, str, Any, str]:
+    """Key under which consecutive append entries can share one master rewrite."""
+    return (append_cfg.get('master'),
+            json.dumps(append_cfg.get('dedupe', {}), sort_keys=True),
+            append_cfg.get('chunksize'),
+            json.dumps(append_cfg.get('schema'), sort_keys=True))
+
+
 def run_append_step(config: Dict[str, Any]) -> int:
     """Run append/post-processing step (append transformed snapshots to a master CSV)."""
     logger = logging.getLogger(__name__)
@@ -162,24 +357,63 @@ def run_append_step(config: Dict[str, Any]) -> int:
     if not appends:
         return appended_count
 
-    for append_cfg in appends:
+    import numpy as np
+    import pandas as pd
+
+    # Consecutive entries feeding the same master with the same dedupe rules are
+    # merged, so the master is read and rewritten once rather than once per source
+    for _, group in groupby(appends, key=_append_group_key):
+        group = list(group)
+        append_cfg = group[0]
         try:
-            source_file = append_cfg['source']
+            source_files = [cfg['source'] for cfg in group]
             master_file = append_cfg['master']
             dedupe = append_cfg.get('dedupe', {})  # {'key': 'OpportunityId', 'keep': 'latest'}
-
-            logger.info(f"Appending {source_file} -> {master_file}")
-
-            # Read source
-            src_df = pd.read_csv(source_file)
+            # Optional column -> dtype map; declared columns skip type inference
+            schema = append_cfg.get('schema') or None
+
+            logger.info(f"Appending {', '.join(source_files)} -> {master_file}")
+
+            # Read sources
+            sources = [pd.read_csv(source_file, dtype=schema) for source_file in source_files]
+            src_df = sources[0] if len(sources) == 1 else pd.concat(sources, ignore_index=True)
+
+            # Without dedupe, a master whose columns cover the source only needs
+            # the new rows appended; no need to read and rewrite the whole file
+            if not (dedupe and 'key' in dedupe) and os.path.exists(master_file):
+                master_cols = pd.read_csv(master_file, nrows=0).columns.tolist()
+                if set(src_df.columns) <= set(master_cols):
+                    with open(master_file, 'a', newline='', encoding='utf-8', buffering=CSV_BUFFER_BYTES) as out:
+                        src_df.reindex(columns=master_cols).to_csv(out, header=False, index=False)
+                    logger.info(f"Appended {len(src_df)} rows to {master_file}")
+                    appended_count += len(src_df)
+                    continue
+
+            # Large masters with dedupe are streamed in chunks to cap memory
+            if (dedupe and 'key' in dedupe and os.path.exists(master_file)
+                    and os.path.getsize(master_file) >= _CHUNKED_APPEND_MIN_BYTES):
+                key = dedupe['key']
+                master_cols = pd.read_csv(master_file, nrows=0).columns
+                by_snapshot_date = dedupe.get('keep', 'latest') == 'latest' and \
+                    ('snapshot_date' in master_cols or 'snapshot_date' in src_df.columns)
+                dates_ok = not by_snapshot_date or \
+                    ('snapshot_date' in master_cols and 'snapshot_date' in src_df.columns)
+                if key in master_cols and key in src_df.columns and dates_ok:
+                    total = _append_dedupe_chunked(src_df, master_file, key, by_snapshot_date,
+                                                   append_cfg.get('chunksize', 500_000), schema)
+                    logger.info(f"Appended rows. Master now has {total} rows")
+                    appended_count += len(src_df)
+                    continue
 
             # Ensure master exists; if not, write with header
             try:
-                master_df = pd.read_csv(master_file)
-                # Align columns (union) to avoid schema drift failures
-                all_cols = list({*master_df.columns.tolist(), *src_df.columns.tolist()})
-                master_df = master_df.reindex(columns=all_cols)
-                src_df = src_df.reindex(columns=all_cols)
+                master_df = pd.read_csv(master_file, dtype=schema)
+                # Align columns (union) to avoid schema drift failures; skipped
+                # when the schemas already match since reindex copies both frames
+                if master_df.columns.tolist() != src_df.columns.tolist():
+                    all_cols = list({*master_df.columns.tolist(), *src_df.columns.tolist()})
+                    master_df = master_df.reindex(columns=all_cols)
+                    src_df = src_df.reindex(columns=all_cols)
                 combined_df = pd.concat([master_df, src_df], ignore_index=True)
             except FileNotFoundError:
                 combined_df = src_df
@@ -190,42 +424,65 @@ def run_append_step(config: Dict[str, Any]) -> int:
                 keep_strategy = dedupe.get('keep', 'latest')
                 if key in combined_df.columns:
                     if keep_strategy == 'latest' and 'snapshot_date' in combined_df.columns:
-                        combined_df = combined_df.sort_values(by=['snapshot_date']).drop_duplicates(subset=[key], keep='last')
+                        snapshot = pd.to_datetime(combined_df['snapshot_date'], errors='coerce', cache=True)
+                        if dedupe.get('method') == 'sort' or snapshot.isna().any():
+                            combined_df = combined_df.sort_values(by=['snapshot_date']).drop_duplicates(subset=[key], keep='last')
+                        else:
+                            # Latest row per key in one hashed pass instead of a full sort;
+                            # scanning in reverse makes later rows win snapshot_date ties
+                            latest_idx = snapshot[::-1].groupby(combined_df[key][::-1], sort=False, dropna=False).idxmax()
+                            combined_df = combined_df.loc[np.sort(latest_idx.to_numpy())]
                     else:
                         combined_df = combined_df.drop_duplicates(subset=[key], keep='last')
                 else:
                     logger.warning(f"Dedupe key '{key}' not found in columns; skipping dedupe")
 
             # Save master
-            Path(master_file).parent.mkdir(parents=True, exist_ok=True)
-            combined_df.to_csv(master_file, index=False)
+            ensure_dir(os.path.dirname(master_file))
+            _atomic_write_csv(combined_df, master_file)
             logger.info(f"Appended rows. Master now has {len(combined_df)} rows")
             appended_count += len(src_df)
 
         except Exception as e:
-            logger.error(f"Failed to append {append_cfg}: {e}")
+            logger.error(f"Failed to append {group}: {e}")
             raise
 
     return appended_count
 
 
+def _iter_strings(value: Any) -> Iterator[str]:
+    """Yield every string nested in a config value."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for v in value:
+            yield from _iter_strings(v)
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _iter_strings(v)
+
+
 def run_full_pipeline(config_path: str, dry_run: bool = False):
     """Run the complete pipeline."""
     logger = logging.getLogger(__name__)
     
+    from .notifier import notify_status
+    
     # Load configuration
     config = load_config(config_path)
     
     # Apply simple date templating to all string values in config
+    today = date.today().isoformat()
     def _apply_date(value: Any):
         if isinstance(value, str):
-            return value.replace('{date}', date.today().isoformat())
+            return value.replace('{date}', today)
         if isinstance(value, list):
             return [ _apply_date(v) for v in value ]
         if isinstance(value, dict):
             return { k: _apply_date(v) for k, v in value.items() }
         return value
-    config = _apply_date(config)
+    if any('{date}' in s for s in _iter_strings(config)):
+        config = _apply_date(config)
     logger.info(f"Loaded configuration from {config_path}")
     
     if dry_run:
@@ -267,10 +524,9 @@ def run_full_pipeline(config_path: str, dry_run: bool = False):
 
         # Write a machine-readable status file
         logs_dir = Path('logs')
-        logs_dir.mkdir(parents=True, exist_ok=True)
+        ensure_dir(str(logs_dir))
         status_file = logs_dir / 'last_run_status.json'
-        with open(status_file, 'w') as f:
-            json.dump(summary_data, f, indent=2)
+        _atomic_write_json(summary_data, status_file)
 
         # Send notifications
         try:
@@ -286,7 +542,7 @@ def run_full_pipeline(config_path: str, dry_run: bool = False):
         # Record failure status for downstream status checks
         try:
             logs_dir = Path('logs')
-            logs_dir.mkdir(parents=True, exist_ok=True)
+            ensure_dir(str(logs_dir))
             status_file = logs_dir / 'last_run_status.json'
             failure_summary = {
                 'timestamp': datetime.utcnow().isoformat() + 'Z',
@@ -298,8 +554,7 @@ def run_full_pipeline(config_path: str, dry_run: bool = False):
                 'status': 'failure',
                 'error': str(e),
             }
-            with open(status_file, 'w') as f:
-                json.dump(failure_summary, f, indent=2)
+            _atomic_write_json(failure_summary, status_file)
             print("PIPELINE FAILURE")
             try:
                 notify_status(failure_summary)
@@ -311,11 +566,32 @@ def run_full_pipeline(config_path: str, dry_run: bool = False):
         sys.exit(1)
 
 
+# Last parsed status file, keyed by (path, mtime_ns, size)
+_STATUS_CACHE: Dict[str, Any] = {}
+
+
+def read_status(status_path: Path) -> Dict[str, Any]:
+    """
+    Read the last-run status file.
+    
+    The parsed status is reused while the file's mtime and size are
+    unchanged, so in-process pollers only pay for a stat.
+    """
+    st = status_path.stat()
+    key = (str(status_path), st.st_mtime_ns, st.st_size)
+    if _STATUS_CACHE.get('key') != key:
+        with open(status_path, 'rb') as f:
+            _STATUS_CACHE['data'] = _loads(f.read())
+        _STATUS_CACHE['key'] = key
+    return copy.deepcopy(_STATUS_CACHE['data'])
+
+
 def list_salesforce_reports():
     """List available Salesforce reports."""
     logger = logging.getLogger(__name__)
     
     try:
+        from .salesforce_export import SalesforceExporter
         exporter = SalesforceExporter()
         reports = exporter.list_reports()
         
@@ -337,7 +613,8 @@ def list_tableau_projects():
     logger = logging.getLogger(__name__)
     
     try:
-        with TableauPublisher() as publisher:
+        from .tableau_publish import pooled_publisher
+        with pooled_publisher() as publisher:
             projects = publisher.list_projects()
             
             if not projects:
@@ -398,6 +675,11 @@ Examples:
     
     # Execute command
     if args.command == 'run':
+        import pandas as pd
+        # Set once for the whole run, before any worker threads start: renamed,
+        # selected and filtered frames then share data with their source until
+        # one of them is modified
+        pd.set_option('mode.copy_on_write', True)
         run_full_pipeline(args.config, args.dry_run)
     elif args.command == 'list-reports':
         list_salesforce_reports()
@@ -410,14 +692,13 @@ Examples:
             print("No status found. Run the pipeline first.")
             return
         try:
-            with open(status_path, 'r') as f:
-                data = json.load(f)
+            data = read_status(status_path)
         except Exception as exc:
             print(f"Failed to read status file: {exc}")
             sys.exit(2)
 
         if getattr(args, 'json', False):
-            print(json.dumps(data, indent=2))
+            print(_dumps(data).decode('utf-8'))
             return
 
         ts = data.get('timestamp')
@@ -454,5 +735,3 @@ Examples:
 
 if __name__ == '__main__':
     main()
-
-
@@ -0,0 +1,20 @@
+"""
+File-system helpers shared by the pipeline modules.
+"""
+
+import os
+
+# Write buffer for CSV output; the default 8 KiB means a syscall every few rows
+CSV_BUFFER_BYTES = 1024 * 1024
+
+
+# Directories already created by this process; skips repeated makedirs stat walks
+_ENSURED_DIRS = set()
+
+
+def ensure_dir(path: str) -> None:
+    """Create directory path (and parents) once per process."""
+    if not path or path in _ENSURED_DIRS:
+        return
+    os.makedirs(path, exist_ok=True)
+    _ENSURED_DIRS.add(path)
@@ -10,26 +10,261 @@ Usage:
     notify_status(summary_dict)
 """
 
+import atexit
 import json
 import os
+import queue
+import random
 import smtplib
 import ssl
+import threading
+import time
 from email.message import EmailMessage
-from typing import Dict, Any
-from urllib import request
+from functools import lru_cache
+from typing import Dict, Any, Optional
+from urllib import error, request
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # Fall back to urllib for Slack posts
+    requests = None
+
+try:
+    import httpx  # Optional: HTTP/2, so concurrent Slack posts share one connection
+    import h2  # noqa: F401 (needed by httpx for http2=True)
+except ImportError:
+    httpx = None
+
+try:
+    from orjson import dumps as _dumps  # Optional: faster JSON encoding, returns bytes
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+# Upper bound on how long queued notifications are waited for at exit
+_NOTIFY_TIMEOUT = 20
+
+# NOTIFY_ENABLED values that turn notifications off
+_DISABLED_VALUES = frozenset(("0", "false", "no"))
+
+
+@lru_cache(maxsize=None)
+def _notify_settings() -> Dict[str, Any]:
+    """Notification switches from the environment, read once per process on first use."""
+    return {
+        "enabled": os.getenv("NOTIFY_ENABLED", "true").lower() not in _DISABLED_VALUES,
+        "slack_url": os.getenv("NOTIFY_SLACK_WEBHOOK_URL"),
+        "slack_variable": os.getenv("NOTIFY_SLACK_VARIABLE_NAME", "text"),
+    }
+
+
+# Slack responses worth retrying: rate limited or a transient server error
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_SLACK_MAX_RETRIES = 3
+_RETRY_BASE_SECONDS = 1.0
+# Longest single wait, kept well inside the _NOTIFY_TIMEOUT exit flush
+_RETRY_CAP_SECONDS = 10.0
+
+# Keep-alive session reused across Slack posts (created on first use)
+_SLACK_SESSION = None
+_SLACK_SESSION_LOCK = threading.Lock()
+
+
+def _slack_session():
+    """
+    Return the shared Slack HTTP session: an HTTP/2 httpx.Client if httpx is
+    installed, else a requests.Session, or None if neither is.
+    """
+    global _SLACK_SESSION
+    if httpx is None and requests is None:
+        return None
+    with _SLACK_SESSION_LOCK:
+        if _SLACK_SESSION is None:
+            if httpx is not None:
+                session = httpx.Client(http2=True)
+            else:
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            _SLACK_SESSION = session
+    return _SLACK_SESSION
+
+
+def _retry_delay(exc: Exception, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying after exc, or None if it isn't transient."""
+    if httpx is not None and isinstance(exc, httpx.TransportError):
+        retry_after = None
+    elif httpx is not None and isinstance(exc, httpx.HTTPStatusError):
+        if exc.response.status_code not in _RETRY_STATUSES:
+            return None
+        retry_after = exc.response.headers.get("Retry-After")
+    elif requests is not None and isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        retry_after = None
+    elif requests is not None and isinstance(exc, requests.exceptions.HTTPError):
+        if exc.response is None or exc.response.status_code not in _RETRY_STATUSES:
+            return None
+        retry_after = exc.response.headers.get("Retry-After")
+    elif isinstance(exc, error.HTTPError):
+        if exc.code not in _RETRY_STATUSES:
+            return None
+        retry_after = exc.headers.get("Retry-After")
+    elif isinstance(exc, (error.URLError, TimeoutError)):
+        retry_after = None
+    else:
+        return None
+
+    if retry_after is not None:
+        try:
+            return min(_RETRY_CAP_SECONDS, float(retry_after))
+        except ValueError:
+            pass
+    # Exponential backoff with jitter so concurrent senders don't retry in step
+    backoff = _RETRY_BASE_SECONDS * 2 ** attempt
+    return min(_RETRY_CAP_SECONDS, backoff) + random.uniform(0, backoff * 0.25)
 
 
 def _post_slack(webhook_url: str, message_text: str) -> None:
     # Allow customizing the JSON field name to match Slack Workflow Webhook variables.
     # Defaults to 'text' (Incoming Webhooks). For Workflow Builder, set NOTIFY_SLACK_VARIABLE_NAME, e.g., 'Message'.
-    variable_name = os.getenv("NOTIFY_SLACK_VARIABLE_NAME", "text")
-    payload = {variable_name: message_text}
-    data = json.dumps(payload).encode("utf-8")
+    variable_name = _notify_settings()["slack_variable"]
+    # Encoded once and resent as-is on retries
+    data = _dumps({variable_name: message_text})
+    session = _slack_session()
+    # The only retry path for every transport; each attempt takes a rate-limit token
+    for attempt in range(_SLACK_MAX_RETRIES + 1):
+        try:
+            _post_slack_once(webhook_url, data, session)
+            return
+        except Exception as exc:
+            delay = _retry_delay(exc, attempt)
+            if delay is None or attempt == _SLACK_MAX_RETRIES:
+                raise
+            time.sleep(delay)
+
+
+class _TokenBucket:
+    """Blocking rate limiter: consume() waits until a token is available."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Take the token now (possibly going negative) and sleep off the debt,
+            # so callers queue up in order without holding the lock while waiting
+            self._tokens -= 1
+            wait_seconds = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait_seconds:
+            time.sleep(wait_seconds)
+
+
+# Slack allows about one webhook message per second; every post (retries
+# included) goes through this limiter instead of running into 429s
+_SLACK_RATE_LIMIT = _TokenBucket(rate=1.0, capacity=1)
+
+
+def _post_slack_once(webhook_url: str, data: bytes, session=None) -> None:
+    _SLACK_RATE_LIMIT.consume()
+    session = session or _slack_session()
+    if httpx is not None and isinstance(session, httpx.Client):
+        session.post(webhook_url, content=data, headers={"Content-Type": "application/json"},
+                     timeout=10).raise_for_status()
+        return
+    if session is not None:
+        session.post(webhook_url, data=data, headers={"Content-Type": "application/json"},
+                     timeout=10).raise_for_status()
+        return
     req = request.Request(webhook_url, data=data, headers={"Content-Type": "application/json"})
     with request.urlopen(req, timeout=10) as _:
         pass
 
 
+class _SmtpClient:
+    """SMTP connection kept open across sends, reconnected when it goes stale."""
+
+    def __init__(self, host: str, port: int, username: Optional[str], password: Optional[str],
+                 use_tls: bool):
+        self.settings = (host, port, username, password, use_tls)
+        self._server: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "_SmtpClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _connect(self) -> smtplib.SMTP:
+        host, port, username, password, use_tls = self.settings
+        server = smtplib.SMTP(host, port, timeout=15)
+        try:
+            if use_tls:
+                server.starttls(context=ssl.create_default_context())
+            if username and password:
+                server.login(username, password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _is_alive(self) -> bool:
+        try:
+            return self._server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def send(self, msg: EmailMessage) -> None:
+        with self._lock:
+            if self._server is not None and not self._is_alive():
+                self._drop()
+            if self._server is None:
+                self._server = self._connect()
+            self._server.send_message(msg)
+
+    def _drop(self) -> None:
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._server is not None:
+                self._drop()
+
+
+# SMTP client reused across notifications in this process (created on first use)
+_SMTP_CLIENT: Optional[_SmtpClient] = None
+_SMTP_CLIENT_LOCK = threading.Lock()
+
+
+def _smtp_client(host: str, port: int, username: Optional[str], password: Optional[str],
+                 use_tls: bool) -> _SmtpClient:
+    """Return the shared SMTP client, replacing it if the settings changed."""
+    global _SMTP_CLIENT
+    settings = (host, port, username, password, use_tls)
+    with _SMTP_CLIENT_LOCK:
+        if _SMTP_CLIENT is None or _SMTP_CLIENT.settings != settings:
+            if _SMTP_CLIENT is not None:
+                _SMTP_CLIENT.close()
+            _SMTP_CLIENT = _SmtpClient(*settings)
+    return _SMTP_CLIENT
+
+
+def _close_smtp_client() -> None:
+    if _SMTP_CLIENT is not None:
+        _SMTP_CLIENT.close()
+
+
 def _send_email(subject: str, body: str) -> None:
     smtp_host = os.getenv("SMTP_HOST")
     smtp_port = int(os.getenv("SMTP_PORT", "587"))
@@ -49,31 +284,24 @@ def _send_email(subject: str, body: str) -> None:
     msg["Subject"] = subject
     msg.set_content(body)
 
-    if use_tls:
-        context = ssl.create_default_context()
-        with smtplib.SMTP(smtp_host, smtp_port, timeout=15) as server:
-            server.starttls(context=context)
-            if smtp_user and smtp_pass:
-                server.login(smtp_user, smtp_pass)
-            server.send_message(msg)
-    else:
-        with smtplib.SMTP(smtp_host, smtp_port, timeout=15) as server:
-            if smtp_user and smtp_pass:
-                server.login(smtp_user, smtp_pass)
-            server.send_message(msg)
+    _smtp_client(smtp_host, smtp_port, smtp_user, smtp_pass, use_tls).send(msg)
 
 
 def notify_status(summary: Dict[str, Any]) -> None:
     """
     Send notifications based on the provided summary dict produced by the pipeline.
 
+    Returns once the notification is queued; a background thread sends it,
+    and pending notifications are flushed (up to _NOTIFY_TIMEOUT) at exit.
+
     Expected keys:
       - status: "success" | "failure"
       - timestamp, config_path, exported_count, transformed_count, appended_rows, published_count
       - error (optional on failure)
     """
     # Opt-out flag
-    if os.getenv("NOTIFY_ENABLED", "true").lower() in ("0", "false", "no"):
+    settings = _notify_settings()
+    if not settings["enabled"]:
         return
 
     status = summary.get("status", "unknown")
@@ -102,18 +330,62 @@ def notify_status(summary: Dict[str, Any]) -> None:
             f"Error: {error_msg}"
         )
 
-    # Slack
-    slack_url = os.getenv("NOTIFY_SLACK_WEBHOOK_URL")
-    if slack_url:
+    # Sent by a background thread so the caller doesn't wait on the network;
+    # anything still queued is flushed at exit
+    _start_sender()
+    _PENDING.put((settings["slack_url"], title, text))
+
+
+# Notifications waiting for the background sender
+_PENDING: "queue.Queue" = queue.Queue(maxsize=100)
+_SENDER: Optional[threading.Thread] = None
+_SENDER_LOCK = threading.Lock()
+
+
+def _start_sender() -> None:
+    global _SENDER
+    with _SENDER_LOCK:
+        if _SENDER is None:
+            _SENDER = threading.Thread(target=_send_pending, name="notifier", daemon=True)
+            _SENDER.start()
+            # atexit runs handlers last-in first-out: flush the queue, then
+            # QUIT the SMTP session the flushed emails went out on
+            atexit.register(_close_smtp_client)
+            atexit.register(_flush_pending)
+
+
+def _send_pending() -> None:
+    while True:
+        slack_url, title, text = _PENDING.get()
         try:
-            _post_slack(slack_url, text)
-        except Exception:
-            pass
+            _deliver(slack_url, title, text)
+        finally:
+            _PENDING.task_done()
+
+
+def _deliver(slack_url: Optional[str], title: str, text: str) -> None:
+    # Sent one after the other on the sender thread: Slack posts are paced at
+    # 1/s and email shares one SMTP connection, so extra threads would gain
+    # nothing, and new threads can't be started once interpreter shutdown (and
+    # with it the atexit flush) has begun. Failures are ignored
+    if slack_url:
+        _ignore_errors(_post_slack, slack_url, text)
+    _ignore_errors(_send_email, title, text)
+
 
-    # Email
+def _ignore_errors(func, *args) -> None:
     try:
-        _send_email(subject=title, body=text)
+        func(*args)
     except Exception:
         pass
 
 
+def _flush_pending(timeout: float = _NOTIFY_TIMEOUT) -> None:
+    """Wait up to timeout seconds for queued notifications to be sent."""
+    deadline = time.monotonic() + timeout
+    with _PENDING.all_tasks_done:
+        while _PENDING.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            _PENDING.all_tasks_done.wait(remaining)
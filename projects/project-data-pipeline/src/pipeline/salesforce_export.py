@@ -5,18 +5,37 @@ Exports Salesforce reports to CSV format using the Reports API.
 Handles authentication, report execution, and data retrieval.
 """
 
-import os
 import csv
+import os
 import logging
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
 from simple_salesforce import Salesforce
 from dotenv import load_dotenv
 
+from .fsutil import CSV_BUFFER_BYTES, ensure_dir
+
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+_CSV_BATCH_ROWS = 5000
+
+
+def _cell_value(data: Dict):
+    """
+    CSV value of a report data cell.
+    
+    Mapping values (e.g. currency amounts) are written as OrderedDict reprs,
+    the format simple_salesforce's parser produces and the transformer expects.
+    """
+    value = data.get('value', '')
+    if isinstance(value, dict) and not isinstance(value, OrderedDict):
+        value = OrderedDict(value)
+    return value
+
 
 class SalesforceExporter:
     """Handles Salesforce report exports to CSV."""
@@ -84,40 +103,63 @@ class SalesforceExporter:
             if not rows:
                 logger.warning(f"No data found in report {report_id}")
                 return output_path
+            if report_data.get('allData') is False:
+                logger.warning(f"Report {report_id} returned only the first {len(rows)} rows "
+                               f"(Reports API detail-row limit); the export is truncated")
             
             # Get column metadata
             columns = report_data.get('reportMetadata', {}).get('detailColumns', [])
+            row_count = self._write_rows(rows, columns, output_path)
             
-            # Create output directory if it doesn't exist
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # Write CSV file
-            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                if columns:
-                    # Write header
-                    writer = csv.writer(csvfile)
-                    writer.writerow(columns)
-                    
-                    # Write data rows
-                    for row in rows:
-                        # Extract data values from row structure
-                        data_values = []
-                        for data in row.get('dataCells', []):
-                            data_values.append(data.get('value', ''))
-                        writer.writerow(data_values)
-                else:
-                    logger.warning("No column metadata found, writing raw data")
-                    writer = csv.writer(csvfile)
-                    for row in rows:
-                        writer.writerow([str(row)])
-            
-            logger.info(f"Successfully exported {len(rows)} rows to {output_path}")
+            logger.info(f"Successfully exported {row_count} rows to {output_path}")
             return output_path
             
         except Exception as e:
             logger.error(f"Failed to export report {report_id}: {e}")
             raise
     
+    def _write_rows(self, rows: Iterable[Dict], columns: List[str], output_path: str) -> int:
+        """
+        Write report detail rows to CSV in batches.
+        
+        The file is only created once the first row arrives.
+        
+        Returns:
+            Number of rows written
+        """
+        rows = iter(rows)
+        if not columns:
+            logger.warning("No column metadata found, writing raw data")
+        
+        row_count = 0
+        csvfile = None
+        try:
+            while True:
+                batch = list(islice(rows, _CSV_BATCH_ROWS))
+                if not batch:
+                    break
+                if csvfile is None:
+                    # Create output directory if it doesn't exist
+                    ensure_dir(os.path.dirname(output_path))
+                    csvfile = open(output_path, 'w', newline='', encoding='utf-8',
+                                   buffering=CSV_BUFFER_BYTES)
+                    writer = csv.writer(csvfile)
+                    if columns:
+                        writer.writerow(columns)
+                
+                # One writerows call per batch keeps the row loop in the csv C writer;
+                # rows are generated as it consumes them, so only one is built at a time
+                if columns:
+                    writer.writerows([_cell_value(data) for data in row.get('dataCells', ())]
+                                     for row in batch)
+                else:
+                    writer.writerows([str(row)] for row in batch)
+                row_count += len(batch)
+        finally:
+            if csvfile is not None:
+                csvfile.close()
+        return row_count
+    
     def list_reports(self, folder_id: Optional[str] = None) -> List[Dict]:
         """
         List available reports in Salesforce.
@@ -1,62 +1,239 @@
 """
 Tableau Publishing Module
 
-Publishes CSV data to Tableau Server as datasources and workbooks.
+Publishes CSV data to Tableau Server as datasources (converted to .hyper
+extracts) and workbooks.
 Handles authentication, file upload, and metadata management.
 """
 
+import atexit
+import hashlib
+import mmap
 import os
 import logging
-from typing import Dict, List, Optional, Union
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
+import requests
 import tableauserverclient as TSC
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from tableauserverclient.server import RequestFactory
+from tableauserverclient.server.endpoint.exceptions import InternalServerError
+from urllib3.util.retry import Retry
 
-# Load environment variables
-load_dotenv()
+try:
+    import xxhash  # Optional: faster content hashing than hashlib
+except ImportError:
+    xxhash = None
+
+try:
+    import pantab  # Optional: CSV -> .hyper conversion before publishing
+except ImportError:
+    pantab = None
 
 logger = logging.getLogger(__name__)
 
+# Environment variables read by TableauPublisher._connect
+_CREDENTIAL_VARS = (
+    'TABLEAU_SERVER_URL', 'TABLEAU_SITE', 'TABLEAU_USERNAME', 'TABLEAU_PASSWORD',
+    'TABLEAU_PAT_NAME', 'TABLEAU_PAT_SECRET',
+)
+
+
+# Files at least this large go up in chunks of this size, each retried on its own
+_UPLOAD_CHUNK_BYTES = 32 * 1024 * 1024
+_UPLOAD_RETRIES = 3
+_HASH_BLOCK_BYTES = 1024 * 1024
+
+# Connection pool size; covers publish_datasources' concurrent uploads
+_HTTP_POOL_SIZE = 32
+
+
+@lru_cache(maxsize=None)
+def _credentials() -> Dict[str, Optional[str]]:
+    """
+    Tableau settings from the environment, read once per process.
+    
+    The .env file is loaded on the first call rather than at import time.
+    """
+    load_dotenv()
+    return {name: os.getenv(name) for name in _CREDENTIAL_VARS}
+
+
+def _pooled_session() -> requests.Session:
+    """
+    HTTP session for TSC.Server with a keep-alive pool sized for concurrent uploads.
+    
+    Idempotent requests (lookups) are retried on connection errors and 5xx
+    responses; uploads are not, since Retry skips POST/PUT by default.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=_HTTP_POOL_SIZE,
+        pool_maxsize=_HTTP_POOL_SIZE,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Numeric precisions _csv_to_hyper can store CSV columns at
+_PRECISIONS = ('full', 'float32', 'int32')
+
+
+def _csv_to_hyper(csv_path: str, output_dir: str, precision: str = 'full') -> str:
+    """
+    Convert a CSV file to a single-table .hyper extract in output_dir.
+    
+    Args:
+        csv_path: Path to CSV file
+        output_dir: Directory for the .hyper file
+        precision: 'full' keeps dtypes; 'float32' stores float columns as FP32;
+            'int32' also stores integer columns that fit as int32
+    
+    Returns:
+        Path to the .hyper file
+    """
+    if pantab is None:
+        raise ImportError("Publishing a CSV requires pantab to convert it to a .hyper extract "
+                          "(pip install pantab)")
+    if precision not in _PRECISIONS:
+        raise ValueError(f"precision must be one of {_PRECISIONS}, got {precision!r}")
+    import numpy as np
+    from .transformer import read_csv
+    
+    # Parsed on all cores with pyarrow when it's installed
+    df = read_csv(csv_path)
+    if precision != 'full':
+        # Dashboards rarely need FP64; halving the width halves those columns' bytes
+        for col in df.select_dtypes('float64').columns:
+            df[col] = df[col].astype('float32')
+    if precision == 'int32':
+        info = np.iinfo(np.int32)
+        for col in df.select_dtypes('int64').columns:
+            if df[col].empty or (df[col].min() >= info.min and df[col].max() <= info.max):
+                df[col] = df[col].astype('int32')
+    
+    hyper_path = os.path.join(output_dir, f"{Path(csv_path).stem}.hyper")
+    pantab.frame_to_hyper(df, hyper_path, table='Extract')
+    return hyper_path
+
+
+# Datasource tag holding a hash of the published input, e.g. 'sha:3f2a...'
+_CONTENT_TAG_PREFIX = 'sha:'
+
+
+def _content_hash(file_path: str, precision: str) -> str:
+    """Fast hash of a file's bytes (and the extract precision they'd be published at)."""
+    hasher = xxhash.xxh3_64() if xxhash is not None else hashlib.blake2b(digest_size=8)
+    hasher.update(precision.encode())
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_BYTES), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def _chunk_request(mm: mmap.mmap, offset: int) -> Tuple[bytes, str]:
+    """Multipart request body (a copy of the mapped bytes) for the upload chunk starting at offset."""
+    with memoryview(mm)[offset:offset + _UPLOAD_CHUNK_BYTES] as chunk:
+        return RequestFactory.Fileupload.chunk_req(chunk)
+
+
+_FIELD = TSC.RequestOptions.Field
+_EQUALS = TSC.RequestOptions.Operator.Equals
+
+
+@lru_cache(maxsize=256)
+def _equals_filter(field: str, value: str) -> TSC.RequestOptions:
+    """
+    Request options matching items whose field equals value.
+    
+    Instances are shared between calls (Pager only reads them), so callers
+    must not modify the returned options.
+    """
+    req = TSC.RequestOptions()
+    req.filter.add(TSC.Filter(field, _EQUALS, value))
+    return req
+
 
 class TableauPublisher:
     """Handles publishing data to Tableau Server."""
     
-    def __init__(self):
-        """Initialize Tableau Server connection using environment variables."""
+    def __init__(self, listing_ttl: float = 60):
+        """
+        Initialize Tableau Server connection using environment variables.
+        
+        Args:
+            listing_ttl: Seconds list_projects/list_datasources results are reused
+        """
         self.server = None
         self.auth = None
+        self.listing_ttl = listing_ttl
+        # (method, project_name) -> (fetched at, rows); cleared on publish/create
+        self._listing_cache: Dict[Tuple[str, Optional[str]], Tuple[float, List[Dict]]] = {}
+        # Lookups by name, updated on create/publish: all projects are loaded on
+        # first use, datasources are memoized per name
+        self._project_cache: Dict[str, TSC.ProjectItem] = {}
+        self._projects_loaded = False
+        self._datasource_cache: Dict[Tuple[str, str], Optional[TSC.DatasourceItem]] = {}
+        # Guards the caches (and project creation) when publishing concurrently
+        self._lookup_lock = threading.RLock()
+        self._sign_in_lock = threading.Lock()
         self._connect()
     
     def _connect(self):
         """Establish connection to Tableau Server."""
         try:
-            server_url = os.getenv('TABLEAU_SERVER_URL')
-            site = os.getenv('TABLEAU_SITE', '')
-            username = os.getenv('TABLEAU_USERNAME')
-            password = os.getenv('TABLEAU_PASSWORD')
-            
-            if not all([server_url, username, password]):
-                raise ValueError("Missing required Tableau credentials in .env file")
+            creds = _credentials()
+            server_url = creds['TABLEAU_SERVER_URL']
+            site = creds['TABLEAU_SITE'] or ''
+            username = creds['TABLEAU_USERNAME']
+            password = creds['TABLEAU_PASSWORD']
+            pat_name = creds['TABLEAU_PAT_NAME']
+            pat_secret = creds['TABLEAU_PAT_SECRET']
             
-            # Create authentication object
-            self.auth = TSC.TableauAuth(username, password, site_id=site)
+            if not server_url:
+                raise ValueError("Missing TABLEAU_SERVER_URL in .env file")
             
-            # Create server object
-            self.server = TSC.Server(server_url, use_server_version=True)
+            # Create authentication object; a personal access token is preferred
+            if pat_name and pat_secret:
+                self.auth = TSC.PersonalAccessTokenAuth(pat_name, pat_secret, site_id=site)
+            elif username and password:
+                self.auth = TSC.TableauAuth(username, password, site_id=site)
+            else:
+                raise ValueError("Missing required Tableau credentials in .env file: provide "
+                                 "TABLEAU_PAT_NAME/TABLEAU_PAT_SECRET or TABLEAU_USERNAME/TABLEAU_PASSWORD")
             
-            # Sign in
-            self.server.auth.sign_in(self.auth)
-            logger.info(f"Successfully connected to Tableau Server: {server_url}")
+            # Create server object; all calls share one pooled keep-alive session.
+            # Signing in is deferred to the first API call (see _ensure_signed_in)
+            self.server = TSC.Server(server_url, use_server_version=True, session_factory=_pooled_session)
             
         except Exception as e:
             logger.error(f"Failed to connect to Tableau Server: {e}")
             raise
     
+    def _ensure_signed_in(self):
+        """Sign in on first use; later calls reuse the session's auth token."""
+        if self.server.is_signed_in():
+            return
+        with self._sign_in_lock:
+            if not self.server.is_signed_in():
+                self.server.auth.sign_in(self.auth)
+                logger.info(f"Successfully connected to Tableau Server: {self.server.server_address}")
+    
     def publish_datasource(self, 
                           file_path: str, 
                           datasource_name: str, 
                           project_name: str = 'Default',
-                          overwrite: bool = True) -> str:
+                          overwrite: bool = True,
+                          precision: str = 'full') -> str:
         """
         Publish a CSV file as a Tableau datasource.
         
@@ -65,12 +242,15 @@ class TableauPublisher:
             datasource_name: Name for the datasource in Tableau
             project_name: Project name (default: 'Default')
             overwrite: Whether to overwrite existing datasource
+            precision: Numeric precision of the extract built from a CSV
+                ('full', 'float32' or 'int32')
             
         Returns:
             Datasource ID
         """
         try:
             logger.info(f"Publishing datasource '{datasource_name}' from {file_path}")
+            self._ensure_signed_in()
             
             # Get or create project
             project = self._get_or_create_project(project_name)
@@ -78,22 +258,46 @@ class TableauPublisher:
             # Create datasource item
             datasource_item = TSC.DatasourceItem(project.id, name=datasource_name)
             
-            # Check if datasource already exists
-            existing_datasource = self._find_datasource(datasource_name, project.id)
-            if existing_datasource and overwrite:
-                logger.info(f"Overwriting existing datasource: {existing_datasource.id}")
-                datasource_item = existing_datasource
+            content_tag = f"{_CONTENT_TAG_PREFIX}{_content_hash(file_path, precision)}"
+            existing_datasource = None
+            if overwrite:
+                # Reruns with unchanged input skip the upload entirely. The lookup is
+                # memoized and refreshed by each publish, so only the first publish of
+                # a name pages the server; CreateNew needs no lookup at all
+                existing_datasource = self._find_datasource(datasource_name, project.id)
+                if existing_datasource and content_tag in existing_datasource.tags:
+                    logger.info(f"Datasource '{datasource_name}' is unchanged; skipping publish")
+                    return existing_datasource.id
             
-            # Publish the datasource
-            with open(file_path, 'rb') as f:
-                if existing_datasource and overwrite:
-                    # Update existing datasource
-                    self.server.datasources.update(datasource_item, f)
-                    datasource_id = existing_datasource.id
+            # Publish the datasource; Overwrite mode replaces an existing one by name,
+            # so the new item is used as-is
+            mode = TSC.Server.PublishMode.Overwrite if overwrite else TSC.Server.PublishMode.CreateNew
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                # Tableau ingests CSVs as Hyper anyway; converting locally uploads far fewer bytes
+                if Path(file_path).suffix.lower() == '.csv':
+                    file_path = _csv_to_hyper(file_path, tmp_dir, precision)
+                if os.path.getsize(file_path) < _UPLOAD_CHUNK_BYTES:
+                    new_datasource = self.server.datasources.publish(datasource_item, file_path, mode)
                 else:
-                    # Create new datasource
-                    new_datasource = self.server.datasources.publish(datasource_item, f, 'overwrite')
-                    datasource_id = new_datasource.id
+                    upload_id = self._upload_file(file_path)
+                    new_datasource = self._publish_upload(datasource_item, upload_id,
+                                                          Path(file_path).suffix.lstrip('.'), mode)
+            datasource_id = new_datasource.id
+            
+            # Record the content hash, replacing the previous one. The publish
+            # response needn't echo the overwritten datasource's tags, and
+            # update_tags only deletes tags the item is known to have had, so
+            # they're taken from the datasource found before publishing
+            server_tags = set(new_datasource.tags)
+            if existing_datasource is not None:
+                server_tags |= existing_datasource.tags
+            new_datasource._initial_tags = server_tags
+            new_datasource.tags = {tag for tag in server_tags
+                                   if not tag.startswith(_CONTENT_TAG_PREFIX)} | {content_tag}
+            self.server.datasources.update(new_datasource)
+            with self._lookup_lock:
+                self._datasource_cache[(datasource_name, project.id)] = new_datasource
+                self._listing_cache.clear()
             
             logger.info(f"Successfully published datasource '{datasource_name}' with ID: {datasource_id}")
             return datasource_id
@@ -102,6 +306,81 @@ class TableauPublisher:
             logger.error(f"Failed to publish datasource '{datasource_name}': {e}")
             raise
     
+    def _upload_file(self, file_path: str) -> str:
+        """
+        Upload a file through a fileUploads session, one chunk per request.
+        
+        Failed chunks (5xx or connection errors) are retried with exponential
+        backoff, so a transient error doesn't restart the whole upload.
+        
+        Chunks are sent uncompressed: the REST API doesn't accept a
+        Content-Encoding on fileUploads, and .hyper extracts are already
+        compressed, so gzip/zstd would gain little.
+        
+        Returns:
+            Upload session ID
+        """
+        upload_id = self.server.fileuploads.initiate()
+        with open(file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Not zero-copy: chunk_req still copies each slice into the multipart
+            # body, but slicing the mapping skips a separate read() buffer per chunk.
+            # Sequential readahead keeps the next chunk warm while one is in flight
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            # The next chunk's request body is built (faulting its pages in) on a
+            # worker thread while the current one is being sent
+            with ThreadPoolExecutor(max_workers=1) as builder:
+                pending = builder.submit(_chunk_request, mm, 0)
+                for offset in range(0, len(mm), _UPLOAD_CHUNK_BYTES):
+                    data, content_type = pending.result()
+                    next_offset = offset + _UPLOAD_CHUNK_BYTES
+                    if next_offset < len(mm):
+                        pending = builder.submit(_chunk_request, mm, next_offset)
+                    for attempt in range(_UPLOAD_RETRIES + 1):
+                        try:
+                            self.server.fileuploads.append(upload_id, data, content_type)
+                            break
+                        except (InternalServerError, requests.ConnectionError) as e:
+                            if attempt == _UPLOAD_RETRIES:
+                                raise
+                            delay = 2 ** attempt
+                            logger.warning(f"Upload chunk failed ({e}); retrying in {delay}s")
+                            time.sleep(delay)
+        return upload_id
+    
+    def _publish_upload(self, datasource_item: TSC.DatasourceItem, upload_id: str,
+                        file_extension: str, mode: str) -> TSC.DatasourceItem:
+        """Publish a datasource from a completed fileUploads session."""
+        url = (f"{self.server.datasources.baseurl}?datasourceType={file_extension}"
+               f"&uploadSessionId={upload_id}")
+        if mode == TSC.Server.PublishMode.Overwrite:
+            url += "&overwrite=true"
+        xml_request, content_type = RequestFactory.Datasource.publish_req_chunked(datasource_item)
+        response = self.server.datasources.post_request(url, xml_request, content_type)
+        return TSC.DatasourceItem.from_response(response.content, self.server.namespace)[0]
+    
+    def publish_datasources(self, items: List[Dict[str, Any]], max_workers: int = 4) -> List[str]:
+        """
+        Publish several CSV files as datasources concurrently.
+        
+        Uploads are network bound, so threads overlap them; the first failure
+        (in item order) is re-raised.
+        
+        Args:
+            items: Keyword arguments for publish_datasource, one dict per datasource
+            max_workers: Maximum number of concurrent uploads
+            
+        Returns:
+            Datasource IDs, in item order
+        """
+        self._ensure_signed_in()
+        if max_workers <= 1 or len(items) <= 1:
+            return [self.publish_datasource(**item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            futures = [executor.submit(self.publish_datasource, **item) for item in items]
+            return [future.result() for future in futures]
+    
     def create_workbook(self, 
                        workbook_name: str, 
                        project_name: str = 'Default',
@@ -119,6 +398,7 @@ class TableauPublisher:
         """
         try:
             logger.info(f"Creating workbook '{workbook_name}'")
+            self._ensure_signed_in()
             
             # Get project
             project = self._get_or_create_project(project_name)
@@ -128,6 +408,8 @@ class TableauPublisher:
             
             # Publish empty workbook
             new_workbook = self.server.workbooks.publish(workbook_item, '', 'CreateNew')
+            with self._lookup_lock:
+                self._listing_cache.clear()
             
             logger.info(f"Successfully created workbook '{workbook_name}' with ID: {new_workbook.id}")
             return new_workbook.id
@@ -144,10 +426,14 @@ class TableauPublisher:
             List of project metadata dictionaries
         """
         try:
-            projects = list(TSC.Pager(self.server.projects))
+            cached = self._cached_listing(('projects', None))
+            if cached is not None:
+                return cached
+            
+            self._ensure_signed_in()
             project_list = []
             
-            for project in projects:
+            for project in TSC.Pager(self.server.projects):
                 project_list.append({
                     'id': project.id,
                     'name': project.name,
@@ -156,6 +442,7 @@ class TableauPublisher:
                 })
             
             logger.info(f"Found {len(project_list)} projects")
+            self._store_listing(('projects', None), project_list)
             return project_list
             
         except Exception as e:
@@ -173,16 +460,18 @@ class TableauPublisher:
             List of datasource metadata dictionaries
         """
         try:
-            datasources = list(TSC.Pager(self.server.datasources))
+            cached = self._cached_listing(('datasources', project_name))
+            if cached is not None:
+                return cached
+            
+            self._ensure_signed_in()
+            req = None
+            if project_name:
+                # Filter server-side rather than paging every datasource
+                req = _equals_filter(_FIELD.ProjectName, project_name)
             datasource_list = []
             
-            for datasource in datasources:
-                if project_name:
-                    # Get project info to filter
-                    project = self._get_project_by_name(project_name)
-                    if datasource.project_id != project.id:
-                        continue
-                
+            for datasource in TSC.Pager(self.server.datasources, req):
                 datasource_list.append({
                     'id': datasource.id,
                     'name': datasource.name,
@@ -192,26 +481,42 @@ class TableauPublisher:
                 })
             
             logger.info(f"Found {len(datasource_list)} datasources")
+            self._store_listing(('datasources', project_name), datasource_list)
             return datasource_list
             
         except Exception as e:
             logger.error(f"Failed to list datasources: {e}")
             raise
     
+    def _cached_listing(self, key: Tuple[str, Optional[str]]) -> Optional[List[Dict]]:
+        """Copy of a listing fetched within listing_ttl seconds, else None."""
+        with self._lookup_lock:
+            entry = self._listing_cache.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.listing_ttl:
+            return None
+        return [dict(row) for row in entry[1]]
+    
+    def _store_listing(self, key: Tuple[str, Optional[str]], rows: List[Dict]):
+        with self._lookup_lock:
+            self._listing_cache[key] = (time.monotonic(), [dict(row) for row in rows])
+    
     def _get_or_create_project(self, project_name: str):
         """Get existing project or create new one."""
         try:
-            # Try to find existing project
-            project = self._get_project_by_name(project_name)
-            if project:
+            with self._lookup_lock:
+                # Try to find existing project
+                project = self._get_project_by_name(project_name)
+                if project:
+                    return project
+                
+                # Create new project
+                logger.info(f"Creating new project: {project_name}")
+                new_project = TSC.ProjectItem(name=project_name)
+                project = self.server.projects.create(new_project)
+                self._project_cache[project_name] = project
+                self._listing_cache.clear()
                 return project
             
-            # Create new project
-            logger.info(f"Creating new project: {project_name}")
-            new_project = TSC.ProjectItem(name=project_name)
-            project = self.server.projects.create(new_project)
-            return project
-            
         except Exception as e:
             logger.error(f"Failed to get or create project '{project_name}': {e}")
             raise
@@ -219,11 +524,14 @@ class TableauPublisher:
     def _get_project_by_name(self, project_name: str):
         """Get project by name."""
         try:
-            projects = list(TSC.Pager(self.server.projects))
-            for project in projects:
-                if project.name == project_name:
-                    return project
-            return None
+            with self._lookup_lock:
+                if not self._projects_loaded:
+                    # Project lists are small and stable during a run, so fetch them all
+                    # once; every later lookup (hit or miss) is then a dict access
+                    for project in TSC.Pager(self.server.projects):
+                        self._project_cache.setdefault(project.name, project)
+                    self._projects_loaded = True
+                return self._project_cache.get(project_name)
             
         except Exception as e:
             logger.error(f"Failed to get project '{project_name}': {e}")
@@ -232,20 +540,32 @@ class TableauPublisher:
     def _find_datasource(self, datasource_name: str, project_id: str):
         """Find datasource by name and project."""
         try:
-            datasources = list(TSC.Pager(self.server.datasources))
-            for datasource in datasources:
-                if datasource.name == datasource_name and datasource.project_id == project_id:
-                    return datasource
-            return None
+            key = (datasource_name, project_id)
+            with self._lookup_lock:
+                if key not in self._datasource_cache:
+                    # Server-side name filter; only same-named datasources come back, and
+                    # paging stops at the first one in the project
+                    datasources = TSC.Pager(self.server.datasources, _equals_filter(_FIELD.Name, datasource_name))
+                    self._datasource_cache[key] = next(
+                        (d for d in datasources if d.project_id == project_id), None)
+                return self._datasource_cache[key]
             
         except Exception as e:
             logger.error(f"Failed to find datasource '{datasource_name}': {e}")
             raise
     
+    def refresh(self):
+        """Drop cached lookups and listings so the next call re-reads the server."""
+        with self._lookup_lock:
+            self._project_cache.clear()
+            self._projects_loaded = False
+            self._datasource_cache.clear()
+            self._listing_cache.clear()
+    
     def close(self):
         """Close the Tableau Server connection."""
         try:
-            if self.server and self.auth:
+            if self.server and self.server.is_signed_in():
                 self.server.auth.sign_out()
                 logger.info("Disconnected from Tableau Server")
         except Exception as e:
@@ -260,3 +580,82 @@ class TableauPublisher:
         self.close()
 
 
+# Idle publishers kept signed in, and how long one may sit unused; well inside
+# the server's default session timeout
+_POOL_MAX_IDLE = 8
+_POOL_IDLE_SECONDS = 10 * 60
+
+
+class _PublisherPool:
+    """Keeps signed-in TableauPublisher instances for reuse across publish steps."""
+    
+    def __init__(self, max_size: int = _POOL_MAX_IDLE, idle_seconds: float = _POOL_IDLE_SECONDS):
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        # (last released at, publisher), most recently released last
+        self._idle: List[Tuple[float, TableauPublisher]] = []
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def acquire(self) -> Iterator[TableauPublisher]:
+        """
+        Lease a publisher for the duration of a with-block.
+        
+        A publisher whose block raised is signed out instead of returned to
+        the pool, in case its session is what failed.
+        """
+        publisher = self._checkout()
+        try:
+            yield publisher
+        except BaseException:
+            publisher.close()
+            raise
+        self.release(publisher)
+    
+    def _checkout(self) -> TableauPublisher:
+        with self._lock:
+            stale = self._evict(time.monotonic())
+            publisher = self._idle.pop()[1] if self._idle else None
+        for old in stale:
+            old.close()
+        return publisher or TableauPublisher()
+    
+    def release(self, publisher: TableauPublisher):
+        """Return a publisher to the pool, signing it out if the pool is full."""
+        with self._lock:
+            stale = self._evict(time.monotonic())
+            if len(self._idle) < self.max_size:
+                self._idle.append((time.monotonic(), publisher))
+            else:
+                stale.append(publisher)
+        for old in stale:
+            old.close()
+    
+    def _evict(self, now: float) -> List[TableauPublisher]:
+        """Remove publishers idle too long (caller holds the lock) and return them."""
+        stale = [p for released, p in self._idle if now - released > self.idle_seconds]
+        if stale:
+            self._idle = [(released, p) for released, p in self._idle
+                          if now - released <= self.idle_seconds]
+        return stale
+    
+    def close(self):
+        """Sign out every idle publisher."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for _, publisher in idle:
+            publisher.close()
+
+
+_PUBLISHER_POOL = _PublisherPool()
+atexit.register(_PUBLISHER_POOL.close)
+
+
+def pooled_publisher():
+    """
+    Lease a signed-in TableauPublisher from the process-wide pool.
+    
+    Use as ``with pooled_publisher() as publisher:``; the publisher stays
+    signed in for the next caller instead of signing out at the end.
+    """
+    return _PUBLISHER_POOL.acquire()
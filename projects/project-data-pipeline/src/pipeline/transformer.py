@@ -7,12 +7,256 @@ Supports column operations, filtering, aggregations, and custom expressions.
 
 import pandas as pd
 import numpy as np
+import atexit
 import logging
-from typing import Dict, List, Any, Union
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Dict, Iterator, List, Any, Union
 from pathlib import Path
 
+try:
+    import pyarrow as pa  # Optional: multithreaded CSV parsing
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa = pa_csv = None
+
+try:
+    import numexpr  # Optional: multithreaded evaluation for query/eval on large frames
+except ImportError:
+    numexpr = None
+
+from .fsutil import CSV_BUFFER_BYTES
+
 logger = logging.getLogger(__name__)
 
+# Fields of Salesforce's currency OrderedDict, e.g.
+# OrderedDict([('amount', 120000), ('currency', 'USD')])
+_AMOUNT_PATTERN = r"'amount',\s*(\d+(?:\.\d+)?)"
+_CURRENCY_PATTERN = r"'currency',\s*'([A-Z]{3})'"
+
+# Concurrent SOQL batch queries when resolving IDs to names
+_SOQL_MAX_WORKERS = 8
+
+# Below this many rows numexpr's setup costs more than it saves
+_NUMEXPR_MIN_ROWS = 10_000
+
+# pandas' default missing-value markers, so pyarrow reads the same nulls
+_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+# pandas' default float parser can be off in the last digit; round_trip
+# parses exactly, as pyarrow's reader does
+_FLOAT_PRECISION = 'round_trip'
+
+# Frames at least this long have HTML cleaned in parallel processes
+_PARALLEL_MIN_ROWS = 500_000
+
+# Resolved ID names are reused by later runs for a week; renames in Salesforce
+# show up once an entry expires
+_ID_NAME_CACHE_PATH = os.path.join('data', 'cache', 'sf_id_names.sqlite')
+_ID_NAME_CACHE_TTL = 7 * 24 * 60 * 60
+# Seconds to wait on a cache locked by a transform running in another thread
+_ID_NAME_CACHE_TIMEOUT = 30
+
+# Rows per chunk for load_csv_chunked
+_CSV_CHUNK_ROWS = 500_000
+
+# Transforms that need every row at once; in chunked runs they and the steps
+# after them run on the collected chunks
+_DEFERRED_TRANSFORMS = frozenset({'sort_rows', 'group_aggregate', 'pivot_table', 'data_quality_check'})
+
+# Aggregations a group_aggregate can apply per chunk, and how the partial
+# results are combined
+_PARTIAL_AGGREGATIONS = {'sum': 'sum', 'min': 'min', 'max': 'max', 'count': 'sum', 'size': 'sum'}
+
+# Compiled once for _clean_html_content
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def read_csv(file_path: str) -> pd.DataFrame:
+    """
+    Read a CSV like pd.read_csv, parsing with pyarrow's multithreaded reader when installed.
+    
+    Date/timestamp columns are kept as text, and missing text is NaN, as
+    pandas reads them. Files pyarrow can't parse (bare carriage returns in
+    unquoted fields, duplicate headers) fall back to pandas, which then
+    parses floats exactly too.
+    """
+    if pa_csv is None:
+        return pd.read_csv(file_path, float_precision=_FLOAT_PRECISION)
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+    try:
+        table = pa_csv.read_csv(file_path, parse_options=parse_options, convert_options=pa_csv.ConvertOptions(
+            null_values=_NA_VALUES, strings_can_be_null=True))
+        timestamps = [field.name for field in table.schema if pa.types.is_timestamp(field.type)]
+        if timestamps:
+            # Timestamp text can't be rebuilt exactly from the parsed values
+            table = pa_csv.read_csv(file_path, parse_options=parse_options, convert_options=pa_csv.ConvertOptions(
+                null_values=_NA_VALUES, strings_can_be_null=True,
+                column_types={name: pa.string() for name in timestamps}))
+    except pa.ArrowInvalid:
+        return pd.read_csv(file_path, float_precision=_FLOAT_PRECISION)
+    if len(set(table.column_names)) != table.num_columns:
+        return pd.read_csv(file_path, float_precision=_FLOAT_PRECISION)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_date(field.type):
+            # Dates are only inferred from YYYY-MM-DD, which casting reproduces
+            table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+        elif pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+    df = table.to_pandas()
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+def _read_csv_chunks(file_path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV in chunks of chunksize rows, each with the dtypes read_csv
+    would infer for the whole file.
+    
+    Chunks inferred on their own disagree (an int column with a blank in a
+    later chunk turns float there only), so a first pass works out each
+    column's whole-file dtype and the second reads every chunk with it.
+    """
+    read_options = dict(chunksize=chunksize, na_values=_NA_VALUES, keep_default_na=False,
+                        float_precision=_FLOAT_PRECISION)
+    kinds: Dict[str, set] = {}
+    has_na: Dict[str, bool] = {}
+    for chunk in pd.read_csv(file_path, **read_options):
+        nulls = chunk.isna()
+        for col in chunk.columns:
+            col_nulls = nulls[col]
+            has_na[col] = has_na.get(col, False) or bool(col_nulls.any())
+            # All-missing chunks read as float64 but say nothing about the column
+            if not col_nulls.all():
+                kinds.setdefault(col, set()).add(chunk[col].dtype.kind)
+    
+    dtypes: Dict[str, Any] = {}
+    for col in has_na:
+        col_kinds = kinds.get(col, set())
+        if col_kinds == {'i'} and not has_na[col]:
+            dtypes[col] = 'int64'
+        elif col_kinds <= {'i', 'f'}:
+            dtypes[col] = 'float64'
+        elif col_kinds == {'b'} and not has_na[col]:
+            dtypes[col] = 'bool'
+        else:
+            dtypes[col] = object
+    
+    yield from pd.read_csv(file_path, dtype=dtypes, **read_options)
+
+
+def _clean_html_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Remove HTML tags and normalize whitespace in every column of frame."""
+    def clean(column: pd.Series) -> pd.Series:
+        cleaned = (column.astype(str)
+                   .str.replace(_HTML_TAG_RE, '', regex=True)
+                   .str.replace(_WHITESPACE_RE, ' ', regex=True)
+                   .str.strip())
+        # Replace 'nan' strings with actual NaN
+        return cleaned.mask(cleaned == 'nan', pd.NA)
+    
+    return frame.apply(clean)
+
+
+# Process pool shared by every transformer in this process (created on first use)
+_HTML_POOL = None
+_HTML_POOL_LOCK = threading.Lock()
+
+
+def _html_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared pool for cleaning HTML in parallel.
+    
+    Workers are spawned rather than forked: transforms run on threads, and
+    forking a multithreaded process can copy a lock another thread holds.
+    One pool also keeps concurrent transforms from each starting a full set
+    of workers.
+    """
+    global _HTML_POOL
+    with _HTML_POOL_LOCK:
+        if _HTML_POOL is None:
+            _HTML_POOL = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=get_context('spawn'))
+            atexit.register(_HTML_POOL.shutdown)
+    return _HTML_POOL
+
+
+class _IdNameCache:
+    """SQLite store of Salesforce ID -> name lookups, reused across runs until they expire."""
+    
+    def __init__(self, path: str, ttl_seconds: float = _ID_NAME_CACHE_TTL):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.conn = sqlite3.connect(path, timeout=_ID_NAME_CACHE_TIMEOUT)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS id_names ("
+            "object_type TEXT, name_field TEXT, id TEXT, name TEXT, fetched_at REAL, "
+            "PRIMARY KEY (object_type, name_field, id))"
+        )
+    
+    def get(self, object_type: str, name_field: str, ids) -> Dict[str, Any]:
+        """
+        Cached, unexpired names for the given IDs.
+        
+        A failed read is logged and the IDs it missed are left to be queried.
+        """
+        ids = list(ids)
+        cutoff = time.time() - self.ttl_seconds
+        names = {}
+        try:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(ids), 500):
+                batch = ids[i:i + 500]
+                rows = self.conn.execute(
+                    f"SELECT id, name FROM id_names WHERE object_type = ? AND name_field = ? "
+                    f"AND fetched_at >= ? AND id IN ({', '.join('?' * len(batch))})",
+                    [object_type, name_field, cutoff, *batch],
+                )
+                names.update(rows)
+        except sqlite3.Error as e:
+            logger.warning(f"ID name cache read failed, querying uncached IDs: {e}")
+        return names
+    
+    def put(self, object_type: str, name_field: str, names: Dict[str, Any]):
+        """Insert or refresh names; a failed write is logged and the names are still used."""
+        now = time.time()
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO id_names VALUES (?, ?, ?, ?, ?)",
+                    [(object_type, name_field, id_, name, now) for id_, name in names.items()],
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"ID name cache write failed: {e}")
+    
+    def close(self):
+        self.conn.close()
+
+
+def _to_int64(values: pd.Series) -> np.ndarray:
+    """
+    Convert a column to int64 with missing/unparseable values as 0.
+    
+    Boolean-like strings become 0/1; non-integer numbers raise ValueError.
+    """
+    if values.dtype == object:
+        # Convert common boolean-like strings to 0/1
+        values = values.replace({True: 1, False: 0, 'True': 1, 'False': 0, 'true': 1, 'false': 0})
+    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    numbers = np.where(np.isnan(numbers), 0.0, numbers)
+    if not np.isfinite(numbers).all() or (numbers != np.trunc(numbers)).any():
+        raise ValueError("cannot safely cast non-integer values to int64")
+    return numbers.astype('int64')
+
 
 class DataTransformer:
     """Handles data transformations based on YAML configuration."""
@@ -33,7 +277,7 @@ class DataTransformer:
         """
         try:
             logger.info(f"Loading CSV from {file_path}")
-            self.df = pd.read_csv(file_path)
+            self.df = read_csv(file_path)
             logger.info(f"Loaded {len(self.df)} rows and {len(self.df.columns)} columns")
             return self
             
@@ -41,6 +285,89 @@ class DataTransformer:
             logger.error(f"Failed to load CSV {file_path}: {e}")
             raise
     
+    def load_csv_chunked(self, file_path: str, transforms: List[Dict],
+                         chunksize: int = _CSV_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """
+        Load a CSV chunk by chunk, yielding each chunk with transforms applied.
+        
+        Steps up to the first one that needs every row (sort, aggregate, pivot,
+        data quality checks) run on each chunk as it is read. If there is such
+        a step, the transformed chunks are collected and it and the remaining
+        steps run once on the combined frame, which is yielded last;
+        group_aggregate with sum/min/max/count is reduced per chunk first.
+        
+        Args:
+            file_path: Path to CSV file
+            transforms: List of transformation dictionaries
+            chunksize: Rows per chunk
+            
+        Yields:
+            Transformed DataFrames, to be written out in order
+        """
+        split = next((i for i, t in enumerate(transforms) if t.get('type') in _DEFERRED_TRANSFORMS), len(transforms))
+        chunk_steps, deferred_steps = transforms[:split], transforms[split:]
+        
+        # Partial aggregation is only exact if every function is decomposable
+        first = deferred_steps[0] if deferred_steps else {}
+        partial = first.get('type') == 'group_aggregate' and all(
+            isinstance(func, str) and func in _PARTIAL_AGGREGATIONS
+            for func in first.get('aggregations', {}).values())
+        
+        logger.info(f"Loading CSV from {file_path} in chunks of {chunksize} rows")
+        collected = []
+        for i, chunk in enumerate(_read_csv_chunks(file_path, chunksize)):
+            logger.info(f"Transforming chunk {i+1} ({len(chunk)} rows)")
+            self.df = chunk
+            self.apply_transforms(chunk_steps)
+            if not deferred_steps:
+                yield self.df
+            elif partial:
+                self.apply_transforms(deferred_steps[:1])
+                collected.append(self.df)
+            else:
+                collected.append(self.df)
+        
+        if not deferred_steps:
+            return
+        self.df = pd.concat(collected, ignore_index=True) if collected else pd.DataFrame()
+        collected.clear()
+        if partial:
+            deferred_steps = [dict(first, aggregations={
+                col: _PARTIAL_AGGREGATIONS[func] for col, func in first['aggregations'].items()
+            })] + deferred_steps[1:]
+        self.apply_transforms(deferred_steps)
+        yield self.df
+    
+    def transform_csv_chunked(self, input_path: str, output_path: str, transforms: List[Dict],
+                              chunksize: int = _CSV_CHUNK_ROWS) -> str:
+        """
+        Transform a CSV chunk by chunk, appending each result to output_path.
+        
+        Args:
+            input_path: Path to CSV file
+            output_path: Path to save CSV file (may be the input file)
+            transforms: List of transformation dictionaries
+            chunksize: Rows per chunk
+            
+        Returns:
+            Path to saved file
+        """
+        # Written beside the output and moved into place, since input and
+        # output are often the same file
+        tmp_path = f"{output_path}.partial"
+        rows = 0
+        try:
+            for i, chunk in enumerate(self.load_csv_chunked(input_path, transforms, chunksize)):
+                self.save_csv(tmp_path, append=i > 0)
+                rows += len(chunk)
+            os.replace(tmp_path, output_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        logger.info(f"Saved {rows} rows to {output_path}")
+        return output_path
+    
     def apply_transforms(self, transforms: List[Dict]) -> 'DataTransformer':
         """
         Apply a list of transformations to the DataFrame.
@@ -62,88 +389,35 @@ class DataTransformer:
         
         return self
     
+    # transform type -> handler(self, transform)
+    _TRANSFORM_DISPATCH = {
+        'rename_columns': lambda self, t: self._rename_columns(t.get('mapping', {})),
+        'filter_rows': lambda self, t: self._filter_rows(t.get('expr', '')),
+        'derive_column': lambda self, t: self._derive_column(t.get('name', ''), t.get('expr', '')),
+        'add_constant_column': lambda self, t: self._add_constant_column(t.get('name', ''), t.get('value', None)),
+        'data_quality_check': lambda self, t: self._data_quality_check(t.get('checks', [])),
+        'extract_currency': lambda self, t: self._extract_currency(t.get('column', ''), t.get('output_column', '')),
+        'extract_currency_code': lambda self, t: self._extract_currency_code(
+            t.get('column', ''), t.get('output_column', '')),
+        'resolve_ids_to_names': lambda self, t: self._resolve_ids_to_names(t.get('mappings', [])),
+        'drop_columns': lambda self, t: self._drop_columns(t.get('columns', [])),
+        'sort_rows': lambda self, t: self._sort_rows(t.get('by', []), t.get('ascending', True)),
+        'group_aggregate': lambda self, t: self._group_aggregate(t.get('group_by', []), t.get('aggregations', {})),
+        'pivot_table': lambda self, t: self._pivot_table(
+            t.get('index', []), t.get('columns', []), t.get('values', []), t.get('aggfunc', 'sum')),
+        'select_columns': lambda self, t: self._select_columns(t.get('columns', [])),
+        'cast_dtypes': lambda self, t: self._cast_dtypes(t.get('dtypes', {})),
+        'coalesce_columns': lambda self, t: self._coalesce_columns(t.get('target', ''), t.get('sources', [])),
+        'clean_html_content': lambda self, t: self._clean_html_content(t.get('columns', [])),
+    }
+    
     def _apply_single_transform(self, transform: Dict):
         """Apply a single transformation step."""
         transform_type = transform.get('type')
-        
-        if transform_type == 'rename_columns':
-            self._rename_columns(transform.get('mapping', {}))
-            
-        elif transform_type == 'filter_rows':
-            self._filter_rows(transform.get('expr', ''))
-            
-        elif transform_type == 'derive_column':
-            self._derive_column(
-                transform.get('name', ''),
-                transform.get('expr', '')
-            )
-        
-        elif transform_type == 'add_constant_column':
-            self._add_constant_column(
-                transform.get('name', ''),
-                transform.get('value', None)
-            )
-        
-        elif transform_type == 'data_quality_check':
-            self._data_quality_check(transform.get('checks', []))
-        
-        elif transform_type == 'extract_currency':
-            self._extract_currency(
-                transform.get('column', ''),
-                transform.get('output_column', '')
-            )
-        
-        elif transform_type == 'extract_currency_code':
-            self._extract_currency_code(
-                transform.get('column', ''),
-                transform.get('output_column', '')
-            )
-        
-        elif transform_type == 'resolve_ids_to_names':
-            self._resolve_ids_to_names(
-                transform.get('mappings', [])
-            )
-            
-        elif transform_type == 'drop_columns':
-            self._drop_columns(transform.get('columns', []))
-            
-        elif transform_type == 'sort_rows':
-            self._sort_rows(
-                transform.get('by', []),
-                transform.get('ascending', True)
-            )
-            
-        elif transform_type == 'group_aggregate':
-            self._group_aggregate(
-                transform.get('group_by', []),
-                transform.get('aggregations', {})
-            )
-            
-        elif transform_type == 'pivot_table':
-            self._pivot_table(
-                transform.get('index', []),
-                transform.get('columns', []),
-                transform.get('values', []),
-                transform.get('aggfunc', 'sum')
-            )
-        
-        elif transform_type == 'select_columns':
-            self._select_columns(transform.get('columns', []))
-        
-        elif transform_type == 'cast_dtypes':
-            self._cast_dtypes(transform.get('dtypes', {}))
-
-        elif transform_type == 'coalesce_columns':
-            self._coalesce_columns(
-                transform.get('target', ''),
-                transform.get('sources', [])
-            )
-        
-        elif transform_type == 'clean_html_content':
-            self._clean_html_content(transform.get('columns', []))
-            
-        else:
+        handler = self._TRANSFORM_DISPATCH.get(transform_type)
+        if handler is None:
             raise ValueError(f"Unknown transform type: {transform_type}")
+        handler(self, transform)
     
     def _rename_columns(self, mapping: Dict[str, str]):
         """Rename columns according to mapping."""
@@ -156,9 +430,10 @@ class DataTransformer:
             return
         
         original_count = len(self.df)
-        self.df = self.df.query(expr)
+        engine = self._expression_engine()
+        self.df = self.df.query(expr, engine=engine)
         filtered_count = len(self.df)
-        logger.info(f"Filtered rows: {original_count} -> {filtered_count} (removed {original_count - filtered_count})")
+        logger.info(f"Filtered rows ({engine}): {original_count} -> {filtered_count} (removed {original_count - filtered_count})")
     
     def _derive_column(self, name: str, expr: str):
         """Create a new column using pandas eval expression."""
@@ -167,12 +442,19 @@ class DataTransformer:
         
         try:
             # Use pandas eval for safe expression evaluation
-            self.df[name] = self.df.eval(expr)
-            logger.info(f"Created derived column '{name}' with expression: {expr}")
+            engine = self._expression_engine()
+            self.df[name] = self.df.eval(expr, engine=engine)
+            logger.info(f"Created derived column '{name}' with expression ({engine}): {expr}")
         except Exception as e:
             logger.error(f"Failed to create derived column '{name}': {e}")
             raise
     
+    def _expression_engine(self) -> str:
+        """Engine for query/eval: numexpr when installed and the frame is large enough."""
+        if numexpr is not None and len(self.df) >= _NUMEXPR_MIN_ROWS:
+            return 'numexpr'
+        return 'python'
+    
     def _add_constant_column(self, name: str, value: Any):
         """Add a column with a constant value for all rows."""
         if not name:
@@ -182,15 +464,32 @@ class DataTransformer:
 
     def _clean_html_content(self, columns: List[str]):
         """Clean HTML tags and normalize whitespace in specified columns."""
-        import re
-        for col in columns:
-            if col in self.df.columns:
-                # Remove HTML tags and normalize whitespace
-                self.df[col] = self.df[col].astype(str).str.replace(r'<[^>]+>', '', regex=True)
-                self.df[col] = self.df[col].str.replace(r'\s+', ' ', regex=True).str.strip()
-                # Replace 'nan' strings with actual NaN
-                self.df[col] = self.df[col].replace('nan', pd.NA)
-                logger.info(f"Cleaned HTML content in column '{col}'")
+        frame_columns = set(self.df.columns)
+        present = [col for col in columns if col in frame_columns]
+        if not present:
+            return
+        
+        workers = os.cpu_count() or 1
+        if len(self.df) >= _PARALLEL_MIN_ROWS and workers > 1:
+            # The regexes run per value in Python, so large frames are split by
+            # rows across processes rather than threads
+            bounds = np.linspace(0, len(self.df), workers + 1, dtype=int)
+            parts = [self.df[present].iloc[start:stop] for start, stop in zip(bounds, bounds[1:])]
+            cleaned = pd.concat(_html_pool().map(_clean_html_frame, parts))
+        else:
+            cleaned = _clean_html_frame(self.df[present])
+        self.df[present] = cleaned
+        for col in present:
+            logger.info(f"Cleaned HTML content in column '{col}'")
+    
+    # check type -> handler(self, check name, check)
+    _CHECK_DISPATCH = {
+        'null_check': lambda self, name, c: self._check_nulls(name, c.get('columns', [])),
+        'range_check': lambda self, name, c: self._check_range(name, c.get('column', ''), c.get('min'), c.get('max')),
+        'value_check': lambda self, name, c: self._check_values(name, c.get('column', ''), c.get('allowed_values', [])),
+        'row_count_check': lambda self, name, c: self._check_row_count(
+            name, c.get('min_rows', 0), c.get('max_rows', float('inf'))),
+    }
     
     def _data_quality_check(self, checks: List[Dict]):
         """Perform data quality checks and log results."""
@@ -203,16 +502,11 @@ class DataTransformer:
             check_name = check.get('name', f'Check {i+1}')
             
             try:
-                if check_type == 'null_check':
-                    self._check_nulls(check_name, check.get('columns', []))
-                elif check_type == 'range_check':
-                    self._check_range(check_name, check.get('column', ''), check.get('min'), check.get('max'))
-                elif check_type == 'value_check':
-                    self._check_values(check_name, check.get('column', ''), check.get('allowed_values', []))
-                elif check_type == 'row_count_check':
-                    self._check_row_count(check_name, check.get('min_rows', 0), check.get('max_rows', float('inf')))
-                else:
+                handler = self._CHECK_DISPATCH.get(check_type)
+                if handler is None:
                     logger.warning(f"Unknown check type: {check_type}")
+                else:
+                    handler(self, check_name, check)
             except Exception as e:
                 logger.error(f"Data quality check '{check_name}' failed: {e}")
     
@@ -221,11 +515,9 @@ class DataTransformer:
         if not columns:
             return
         
-        null_counts = {}
-        for col in columns:
-            if col in self.df.columns:
-                null_count = self.df[col].isnull().sum()
-                null_counts[col] = null_count
+        frame_columns = set(self.df.columns)
+        present = [col for col in columns if col in frame_columns]
+        null_counts = self.df[present].isnull().sum().to_dict()
         
         total_nulls = sum(null_counts.values())
         if total_nulls > 0:
@@ -239,13 +531,11 @@ class DataTransformer:
             logger.warning(f"{check_name}: Column '{column}' not found")
             return
         
-        numeric_data = pd.to_numeric(self.df[column], errors='coerce')
-        out_of_range = 0
-        
-        if min_val is not None:
-            out_of_range += (numeric_data < min_val).sum()
-        if max_val is not None:
-            out_of_range += (numeric_data > max_val).sum()
+        numeric_data = pd.to_numeric(self.df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        # NaN compares False both ways, so missing values count as in range
+        low = -np.inf if min_val is None else float(min_val)
+        high = np.inf if max_val is None else float(max_val)
+        out_of_range = int(np.count_nonzero((numeric_data < low) | (numeric_data > high)))
         
         if out_of_range > 0:
             logger.warning(f"{check_name}: {out_of_range} values out of range [{min_val}, {max_val}] in '{column}'")
@@ -284,26 +574,13 @@ class DataTransformer:
         if not output_column:
             output_column = f"{column}_numeric"
         
-        def extract_amount(value):
-            if pd.isna(value) or value == '':
-                return None
-            try:
-                # Handle OrderedDict format: OrderedDict([('amount', 120000), ('currency', 'USD')])
-                if 'OrderedDict' in str(value):
-                    import re
-                    # Use regex to extract the amount value
-                    match = re.search(r"'amount',\s*(\d+(?:\.\d+)?)", str(value))
-                    if match:
-                        return float(match.group(1))
-                    else:
-                        return None
-                else:
-                    # Try direct conversion for simple values
-                    return float(value)
-            except (ValueError, AttributeError):
-                return None
-        
-        self.df[output_column] = self.df[column].apply(extract_amount)
+        # Handle OrderedDict format: OrderedDict([('amount', 120000), ('currency', 'USD')]);
+        # other values are converted directly
+        text = self.df[column].astype(str)
+        is_ordered_dict = text.str.contains('OrderedDict', regex=False)
+        amounts = pd.to_numeric(text.str.extract(_AMOUNT_PATTERN, expand=False), errors='coerce')
+        plain = pd.to_numeric(self.df[column].where(~is_ordered_dict), errors='coerce')
+        self.df[output_column] = amounts.where(is_ordered_dict, plain)
         logger.info(f"Extracted currency values from '{column}' to '{output_column}'")
     
     def _extract_currency_code(self, column: str, output_column: str):
@@ -315,22 +592,10 @@ class DataTransformer:
         if not output_column:
             output_column = f"{column}_currency"
         
-        def extract_code(value):
-            if pd.isna(value) or value == '':
-                return None
-            try:
-                text = str(value)
-                if 'OrderedDict' in text:
-                    import re
-                    match = re.search(r"'currency',\s*'([A-Z]{3})'", text)
-                    if match:
-                        return match.group(1)
-                    return None
-                return None
-            except Exception:
-                return None
-        
-        self.df[output_column] = self.df[column].apply(extract_code)
+        # Only the OrderedDict format carries a currency code
+        text = self.df[column].astype(str)
+        is_ordered_dict = text.str.contains('OrderedDict', regex=False)
+        self.df[output_column] = text.str.extract(_CURRENCY_PATTERN, expand=False).where(is_ordered_dict)
         logger.info(f"Extracted currency codes from '{column}' to '{output_column}'")
     
     def _resolve_ids_to_names(self, mappings: List[Dict]):
@@ -338,14 +603,14 @@ class DataTransformer:
         if not mappings:
             return
         
-        # Import here to avoid circular imports
+        # Names resolved by earlier runs; Salesforce is only connected to if some
+        # IDs aren't cached
+        sf = None
         try:
-            from .salesforce_export import SalesforceExporter
-            sf_exporter = SalesforceExporter()
-            sf = sf_exporter.sf
+            cache = _IdNameCache(_ID_NAME_CACHE_PATH)
         except Exception as e:
-            logger.error(f"Failed to connect to Salesforce for ID resolution: {e}")
-            return
+            logger.warning(f"ID name cache unavailable, querying all IDs: {e}")
+            cache = None
         
         logger.info("=== RESOLVING IDs TO NAMES ===")
         
@@ -367,33 +632,64 @@ class DataTransformer:
                 
                 logger.info(f"Resolving {len(unique_ids)} {object_type} IDs in column '{column}'")
                 
-                # Query Salesforce to get ID -> Name mappings
-                id_to_name = {}
+                id_to_name = cache.get(object_type, name_field, unique_ids) if cache else {}
+                uncached_ids = [i for i in unique_ids if i not in id_to_name]
+                if id_to_name:
+                    logger.info(f"{len(id_to_name)} {object_type} names cached; querying {len(uncached_ids)}")
+                if uncached_ids and sf is None:
+                    # Import here to avoid circular imports
+                    try:
+                        from .salesforce_export import SalesforceExporter
+                        sf_exporter = SalesforceExporter()
+                        sf = sf_exporter.sf
+                    except Exception as e:
+                        logger.error(f"Failed to connect to Salesforce for ID resolution: {e}")
+                        if cache:
+                            cache.close()
+                        return
+                
+                # Query Salesforce to get ID -> Name mappings; batches run concurrently
+                # since each is a round trip
                 batch_size = 200  # Salesforce SOQL limit
+                batches = [uncached_ids[i:i + batch_size] for i in range(0, len(uncached_ids), batch_size)]
                 
-                for i in range(0, len(unique_ids), batch_size):
-                    batch_ids = unique_ids[i:i + batch_size]
+                def query_batch(batch_ids):
                     # Create SOQL query with IN clause
                     id_list = "', '".join(batch_ids)
                     query = f"SELECT Id, {name_field} FROM {object_type} WHERE Id IN ('{id_list}')"
-                    
-                    try:
-                        result = sf.query(query)
-                        for record in result['records']:
-                            id_to_name[record['Id']] = record[name_field]
-                    except Exception as e:
-                        logger.warning(f"Failed to query batch {i//batch_size + 1}: {e}")
+                    return sf.query(query)['records']
+                
+                with ThreadPoolExecutor(max_workers=max(1, min(_SOQL_MAX_WORKERS, len(batches)))) as executor:
+                    futures = [executor.submit(query_batch, batch_ids) for batch_ids in batches]
+                    for batch_number, future in enumerate(futures, 1):
+                        try:
+                            batch_names = {record['Id']: record[name_field] for record in future.result()}
+                        except Exception as e:
+                            logger.warning(f"Failed to query batch {batch_number}: {e}")
+                            continue
+                        id_to_name.update(batch_names)
+                        if cache:
+                            cache.put(object_type, name_field, batch_names)
                 
-                # Replace IDs with names in the DataFrame
-                original_count = len(self.df)
-                self.df[column] = self.df[column].map(id_to_name).fillna(self.df[column])
-                resolved_count = (self.df[column] != self.df[column].map(id_to_name).fillna(self.df[column])).sum()
+                # Replace IDs with names in the DataFrame; unresolved IDs are kept.
+                # Each distinct ID is looked up once and the result spread by code
+                ids = self.df[column].astype('category')
+                categories = ids.cat.categories
+                names = categories.map(id_to_name)
+                resolved = np.append(names.notna(), False)
+                # Code -1 (missing) picks the trailing NaN / False
+                labels = np.append(np.where(resolved[:-1], names, categories).astype(object), np.nan)
+                codes = ids.cat.codes.to_numpy()
+                self.df[column] = labels[codes]
                 
-                logger.info(f"Resolved {len(id_to_name)} {object_type} IDs to names in column '{column}'")
+                logger.info(f"Resolved {len(id_to_name)} {object_type} IDs to names in column '{column}' "
+                            f"({int(resolved[codes].sum())} rows)")
                 
             except Exception as e:
                 logger.error(f"Failed to resolve IDs for column '{column}': {e}")
         
+        if cache:
+            cache.close()
         logger.info("=== ID RESOLUTION COMPLETE ===")
     
     def _drop_columns(self, columns: List[str]):
@@ -401,12 +697,14 @@ class DataTransformer:
         if not columns:
             return
         
-        existing_columns = [col for col in columns if col in self.df.columns]
+        # Taken before dropping, so dropped columns aren't reported as missing
+        present = set(self.df.columns)
+        existing_columns = [col for col in columns if col in present]
         if existing_columns:
-            self.df = self.df.drop(columns=existing_columns)
+            self.df.drop(columns=existing_columns, inplace=True)
             logger.info(f"Dropped columns: {existing_columns}")
         
-        missing_columns = [col for col in columns if col not in self.df.columns]
+        missing_columns = [col for col in columns if col not in present]
         if missing_columns:
             logger.warning(f"Columns not found for dropping: {missing_columns}")
     
@@ -415,12 +713,13 @@ class DataTransformer:
         if not by:
             return
         
-        existing_columns = [col for col in by if col in self.df.columns]
+        present = set(self.df.columns)
+        existing_columns = [col for col in by if col in present]
         if existing_columns:
-            self.df = self.df.sort_values(by=existing_columns, ascending=ascending)
+            self.df.sort_values(by=existing_columns, ascending=ascending, inplace=True)
             logger.info(f"Sorted by columns: {existing_columns}")
         
-        missing_columns = [col for col in by if col not in self.df.columns]
+        missing_columns = [col for col in by if col not in present]
         if missing_columns:
             logger.warning(f"Columns not found for sorting: {missing_columns}")
     
@@ -429,7 +728,8 @@ class DataTransformer:
         if not group_by or not aggregations:
             return
         
-        existing_group_cols = [col for col in group_by if col in self.df.columns]
+        present = set(self.df.columns)
+        existing_group_cols = [col for col in group_by if col in present]
         if not existing_group_cols:
             logger.warning("No valid group-by columns found")
             return
@@ -437,7 +737,7 @@ class DataTransformer:
         # Build aggregation dictionary
         agg_dict = {}
         for col, func in aggregations.items():
-            if col in self.df.columns:
+            if col in present:
                 agg_dict[col] = func
             else:
                 logger.warning(f"Column '{col}' not found for aggregation")
@@ -451,14 +751,15 @@ class DataTransformer:
         if not index or not values:
             return
         
-        existing_index = [col for col in index if col in self.df.columns]
-        existing_values = [col for col in values if col in self.df.columns]
+        present = set(self.df.columns)
+        existing_index = [col for col in index if col in present]
+        existing_values = [col for col in values if col in present]
         
         if not existing_index or not existing_values:
             logger.warning("Missing required columns for pivot table")
             return
         
-        columns_param = [col for col in columns if col in self.df.columns] if columns else None
+        columns_param = [col for col in columns if col in present] if columns else None
         
         self.df = pd.pivot_table(
             self.df,
@@ -475,7 +776,8 @@ class DataTransformer:
         """Select and order columns. Ignores columns that do not exist; preserves only provided ones."""
         if not columns:
             return
-        existing = [c for c in columns if c in self.df.columns]
+        present = set(self.df.columns)
+        existing = [c for c in columns if c in present]
         if not existing:
             logger.warning("No matching columns found to select")
             return
@@ -486,21 +788,21 @@ class DataTransformer:
         """Cast columns to specified dtypes. Supported: float64, int64, bool, string, datetime64[ns]."""
         if not dtypes:
             return
+        present = set(self.df.columns)
         for col, dtype in dtypes.items():
-            if col not in self.df.columns:
+            if col not in present:
                 logger.warning(f"Column '{col}' not found for dtype casting")
                 continue
             try:
                 if dtype in ('float', 'float64'):
                     self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
                 elif dtype in ('int', 'int64'):
-                    # Convert common boolean-like strings to 0/1 then to int
-                    self.df[col] = (self.df[col]
-                        .replace({True: 1, False: 0, 'True': 1, 'False': 0, 'true': 1, 'false': 0})
-                    )
-                    self.df[col] = pd.to_numeric(self.df[col], errors='coerce').astype('Int64').astype('float').fillna(0).astype('int64')
+                    self.df[col] = _to_int64(self.df[col])
                 elif dtype in ('bool', 'boolean'):
-                    self.df[col] = self.df[col].astype(str).str.lower().isin(['true', '1', 'yes', 'y'])
+                    if pd.api.types.is_bool_dtype(self.df[col]):
+                        self.df[col] = self.df[col].astype(bool)
+                    else:
+                        self.df[col] = self.df[col].astype(str).str.lower().isin(['true', '1', 'yes', 'y'])
                 elif dtype in ('str', 'string', 'object'):
                     self.df[col] = self.df[col].astype(str)
                 elif dtype.startswith('datetime'):
@@ -517,11 +819,21 @@ class DataTransformer:
         if target and target not in self.df.columns:
             # initialize target with NaN
             self.df[target] = pd.NA
+        present = set(self.df.columns)
         work_col = target if target else sources[0]
-        series = self.df[work_col] if work_col in self.df.columns else pd.Series([pd.NA]*len(self.df))
+        if work_col in present:
+            result = self.df[work_col].to_numpy(dtype=object, copy=True)
+        else:
+            result = np.full(len(self.df), pd.NA, dtype=object)
+        # Fill the gaps source by source in one buffer, stopping once none are left
+        missing = pd.isna(result)
         for col in sources:
-            if col in self.df.columns:
-                series = series.combine_first(self.df[col])
+            if not missing.any():
+                break
+            if col in present:
+                result = np.where(missing, self.df[col].to_numpy(dtype=object), result)
+                missing = pd.isna(result)
+        series = pd.Series(result, index=self.df.index).infer_objects()
         if target:
             self.df[target] = series
         else:
@@ -529,12 +841,13 @@ class DataTransformer:
             self.df[sources[0]] = series
         logger.info(f"Coalesced columns into '{target or sources[0]}': {sources}")
     
-    def save_csv(self, output_path: str) -> str:
+    def save_csv(self, output_path: str, append: bool = False) -> str:
         """
         Save DataFrame to CSV file.
         
         Args:
             output_path: Path to save CSV file
+            append: Append rows without a header instead of overwriting
             
         Returns:
             Path to saved file
@@ -543,7 +856,11 @@ class DataTransformer:
             # Create output directory if it doesn't exist
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
             
-            self.df.to_csv(output_path, index=False)
+            # pandas formats the rows (pyarrow's writer would change how floats,
+            # booleans and quoting look); a large buffer cuts the write calls
+            with open(output_path, 'a' if append else 'w', newline='', encoding='utf-8',
+                      buffering=CSV_BUFFER_BYTES) as f:
+                self.df.to_csv(f, index=False, header=not append)
             logger.info(f"Saved {len(self.df)} rows to {output_path}")
             return output_path
             
@@ -569,5 +886,3 @@ class DataTransformer:
             'memory_usage': self.df.memory_usage(deep=True).sum(),
             'null_counts': self.df.isnull().sum().to_dict()
         }
-
-
@@ -17,24 +17,34 @@ import argparse
 import sys
 from typing import List, Dict
 
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa  # Optional: single-pass null-aware column comparison
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
+from .transformer import read_csv
+
 
 def load_csv(path: str) -> pd.DataFrame:
     try:
-        return pd.read_csv(path)
+        return read_csv(path)
     except Exception as exc:
         print(f"ERROR: Failed to read CSV '{path}': {exc}")
         sys.exit(2)
 
 
 def compare_schema(sample: pd.DataFrame, current: pd.DataFrame) -> Dict[str, List[str]]:
-    sample_cols = list(sample.columns)
-    current_cols = list(current.columns)
+    sample_cols = sample.columns
+    current_cols = current.columns
 
-    missing_in_current = [c for c in sample_cols if c not in current_cols]
-    extra_in_current = [c for c in current_cols if c not in sample_cols]
-    order_mismatch = (sample_cols != current_cols)
+    # Hash-based set differences, kept in column order
+    missing_in_current = list(sample_cols.difference(current_cols, sort=False))
+    extra_in_current = list(current_cols.difference(sample_cols, sort=False))
+    order_mismatch = not sample_cols.equals(current_cols)
 
     return {
         "missing_in_current": missing_in_current,
@@ -43,6 +53,37 @@ def compare_schema(sample: pd.DataFrame, current: pd.DataFrame) -> Dict[str, Lis
     }
 
 
+def _is_number(values: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype)
+
+
+def _diff_mask(a: pd.Series, b: pd.Series) -> np.ndarray:
+    """Rows where a and b differ as text, with missing values equal to each other."""
+    if _is_number(a) and _is_number(b):
+        # Compared as numbers: no string building, and 1 == 1.0
+        if pd.api.types.is_integer_dtype(a.dtype) and pd.api.types.is_integer_dtype(b.dtype) \
+                and not (a.hasnans or b.hasnans):
+            return a.to_numpy() != b.to_numpy()
+        x = a.to_numpy(dtype="float64", na_value=np.nan)
+        y = b.to_numpy(dtype="float64", na_value=np.nan)
+        return (x != y) & ~(np.isnan(x) & np.isnan(y))
+    if pd.api.types.is_datetime64_any_dtype(a.dtype) and a.dtype == b.dtype:
+        return ((a != b) & ~(a.isna() & b.isna())).to_numpy()
+    if pa is not None:
+        try:
+            arr_a = pa.array(a, from_pandas=True)
+            arr_b = pa.array(b, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arr_a = arr_b = None
+        # Text forms only agree with str() when both sides have the same type
+        # (pyarrow renders 1.0 as "1" and True as "true")
+        if arr_a is not None and arr_a.type == arr_b.type:
+            mask = pc.not_equal(pc.fill_null(pc.cast(arr_a, pa.string()), ""),
+                                pc.fill_null(pc.cast(arr_b, pa.string()), ""))
+            return mask.to_numpy(zero_copy_only=False)
+    return (a.astype(str).fillna("") != b.astype(str).fillna("")).to_numpy()
+
+
 def compare_values(sample: pd.DataFrame, current: pd.DataFrame, key: str, max_examples: int = 5) -> Dict[str, object]:
     if key not in sample.columns or key not in current.columns:
         return {"error": f"Key column '{key}' must exist in both sample and current."}
@@ -60,9 +101,7 @@ def compare_values(sample: pd.DataFrame, current: pd.DataFrame, key: str, max_ex
     for col in common_cols:
         if col == key:
             continue
-        a = merged[f"{col}_s"].astype(str).fillna("")
-        b = merged[f"{col}_c"].astype(str).fillna("")
-        diff_mask = a != b
+        diff_mask = _diff_mask(merged[f"{col}_s"], merged[f"{col}_c"])
         count = int(diff_mask.sum())
         if count > 0:
             mismatches[col] = count
@@ -2,8 +2,7 @@
 """
 Detailed test with payload debug for Slack Workflow webhooks.
 """
-import os, sys
-from datetime import datetime
+import os, sys, time
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from pipeline.notifier import notify_status
 
@@ -13,7 +12,7 @@ print('Variable name:', os.getenv('NOTIFY_SLACK_VARIABLE_NAME','text'))
 
 notify_status({
   'status': 'success',
-  'timestamp': datetime.utcnow().isoformat()+'Z',
+  'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
   'config_path': 'configs/weekly_activity.yaml',
   'exported_count': 2,
   'transformed_count': 2,
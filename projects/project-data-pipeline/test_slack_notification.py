@@ -2,36 +2,49 @@
 """
 Simple test script for Slack notifications.
 """
-import os, sys
-from datetime import datetime
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-from pipeline.notifier import notify_status
+import os, sys, time
+
+# Environment switches, read once
+_DISABLED = os.getenv('NOTIFY_ENABLED', 'true').lower() in frozenset(('0', 'false', 'no'))
+_WEBHOOK = os.getenv('NOTIFY_SLACK_WEBHOOK_URL')
 
-if os.getenv('NOTIFY_ENABLED', 'true').lower() in ('0','false','no'):
+if _DISABLED:
     print('Notifications disabled; set NOTIFY_ENABLED=true in .env')
     raise SystemExit(0)
 
-if not os.getenv('NOTIFY_SLACK_WEBHOOK_URL'):
+if not _WEBHOOK:
     print('Slack webhook not configured; set NOTIFY_SLACK_WEBHOOK_URL in .env')
     raise SystemExit(1)
 
-print('Sending success test...')
-notify_status({
+# Imported only once both checks pass, so a disabled run skips loading requests
+import importlib
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+notify_status = importlib.import_module('pipeline.notifier').notify_status
+
+# Both payloads share one timestamp
+TS = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+success = {
   'status': 'success',
-  'timestamp': datetime.utcnow().isoformat()+'Z',
+  'timestamp': TS,
   'config_path': 'configs/weekly_opportunities.yaml',
   'exported_count': 1,
   'transformed_count': 1,
   'appended_rows': 123,
   'published_count': 0
-})
-print('Sending failure test...')
-notify_status({
+}
+failure = {
   'status': 'failure',
-  'timestamp': datetime.utcnow().isoformat()+'Z',
+  'timestamp': TS,
   'config_path': 'configs/weekly_deal_contribution.yaml',
   'error': 'Simulated failure'
-})
+}
+
+# notify_status only queues; both are sent in the background over the
+# notifier's keep-alive session and flushed before the script exits
+print('Sending success and failure tests...')
+notify_status(success)
+notify_status(failure)
 print('Done. Check Slack.')
 
 
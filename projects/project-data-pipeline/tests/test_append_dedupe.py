@@ -0,0 +1,48 @@
+"""
+Tests for the chunked master dedupe in the append step.
+
+Run from the project root:
+    python -m pytest tests
+"""
+
+import pandas as pd
+
+from src.pipeline.cli import _append_dedupe_chunked
+
+
+def _write_master(path, rows):
+    pd.DataFrame(rows, columns=['Id', 'Amount', 'snapshot_date']).to_csv(path, index=False)
+
+
+def test_empty_snapshot_date_chunk(tmp_path):
+    master = tmp_path / 'master.csv'
+    # The second chunk's snapshot_date is all blank, so pandas reads it as float NaN
+    _write_master(master, [
+        ('a', 1, '2025-09-01'),
+        ('b', 2, '2025-09-01'),
+        ('c', 3, None),
+        ('d', 4, None),
+    ])
+    src = pd.DataFrame({'Id': ['a', 'c', 'e'], 'Amount': [10, 30, 50],
+                        'snapshot_date': ['2025-09-08', '2025-09-08', '2025-09-08']})
+    
+    total = _append_dedupe_chunked(src, str(master), 'Id', True, chunksize=2)
+    
+    result = pd.read_csv(master).set_index('Id')['Amount'].to_dict()
+    assert total == 5
+    # A newer source date replaces the master row; a master row without a date
+    # sorts last and is kept, as in the in-memory dedupe
+    assert result == {'a': 10, 'b': 2, 'c': 3, 'd': 4, 'e': 50}
+
+
+def test_dates_compared_as_dates(tmp_path):
+    master = tmp_path / 'master.csv'
+    # As text '9/9/2025' > '10/1/2025', but it is the older date
+    _write_master(master, [('a', 1, '9/9/2025'), ('b', 2, '10/1/2025')])
+    src = pd.DataFrame({'Id': ['a', 'b'], 'Amount': [10, 20],
+                        'snapshot_date': ['10/1/2025', '9/9/2025']})
+    
+    _append_dedupe_chunked(src, str(master), 'Id', True, chunksize=1)
+    
+    result = pd.read_csv(master).set_index('Id')['Amount'].to_dict()
+    assert result == {'a': 10, 'b': 2}
@@ -0,0 +1,54 @@
+"""
+Tests that chunked transforms write what the whole-file path writes.
+
+Run from the project root:
+    python -m pytest tests
+"""
+
+import pandas as pd
+
+from src.pipeline.transformer import DataTransformer
+
+STEPS = [
+    {'type': 'derive_column', 'name': 'double', 'expr': 'amount * 2'},
+    {'type': 'rename_columns', 'mapping': {'name': 'Name'}},
+]
+
+
+def _transform_both(tmp_path, csv_text, steps, chunksize):
+    source = tmp_path / 'in.csv'
+    source.write_text(csv_text)
+    whole = tmp_path / 'whole.csv'
+    chunked = tmp_path / 'chunked.csv'
+    DataTransformer().load_csv(str(source)).apply_transforms(steps).save_csv(str(whole))
+    DataTransformer().transform_csv_chunked(str(source), str(chunked), steps, chunksize=chunksize)
+    return whole.read_text(), chunked.read_text()
+
+
+def test_blank_in_later_chunk(tmp_path):
+    # count is all integers in the first chunks and has a blank in the last;
+    # code turns non-numeric late, flag is blank late, empty is always blank
+    csv_text = (
+        'name,count,amount,flag,code,empty\n'
+        'a,3,1.5,True,1,\n'
+        'b,4,2,False,2,\n'
+        'c,5,3,True,3,\n'
+        'd,6,4,True,4,\n'
+        'e,7,5,,x,\n'
+        'f,,6,False,6,\n'
+    )
+    
+    whole, chunked = _transform_both(tmp_path, csv_text, STEPS, chunksize=2)
+    
+    assert chunked == whole
+    assert 'a,3.0,' in chunked
+
+
+def test_deferred_steps(tmp_path):
+    csv_text = 'name,amount\na,1\nb,2\nc,3\na,4\nb,\nc,6\n'
+    steps = STEPS + [{'type': 'group_aggregate', 'group_by': ['Name'],
+                      'aggregations': {'amount': 'sum', 'double': 'max'}}]
+    
+    whole, chunked = _transform_both(tmp_path, csv_text, steps, chunksize=4)
+    
+    assert chunked == whole